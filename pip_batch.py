@@ -0,0 +1,33 @@
+"""Batch point-in-polygon with the fastest backend available.
+
+The backend is chosen once at import time: the numba kernels in
+pip_numba.py when numba is installed, then the compiled C kernel in
+pip_simd.py (which does its own AVX2 dispatch) when the shared library has
+been built, and finally the pure NumPy implementation. All of them give
+the same answers as is_point_in_polygon_ray (boundary counts as inside).
+"""
+from polygon_point_pip import EPS, points_in_polygon_ray as _numpy_backend
+
+BACKENDS = {}
+
+try:
+    from pip_numba import points_in_polygon_ray as _numba_backend
+    BACKENDS["numba"] = _numba_backend
+except ImportError:
+    pass
+
+try:
+    from pip_simd import point_in_polygon_batch as _simd_backend
+    BACKENDS["simd"] = _simd_backend
+except ImportError:
+    pass
+
+BACKENDS["numpy"] = _numpy_backend
+
+BACKEND = next(iter(BACKENDS))
+_backend = BACKENDS[BACKEND]
+
+
+def points_in_polygon(points, polygon, eps=EPS):
+    """Return an (N,) boolean mask of which points lie in the polygon."""
+    return _backend(points, polygon, eps)
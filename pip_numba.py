@@ -0,0 +1,332 @@
+"""Numba-compiled versions of the point-in-polygon routines.
+
+These kernels mirror the pure-Python functions in ``polygon_point_pip`` but
+operate on ``float64[:, :]`` vertex arrays of shape (n, 2) and take the query
+point as two scalars, so that per-pixel loops can call them without paying
+interpreter dispatch for every cross product.
+
+Numba is an optional dependency: importing this module raises ImportError
+when it is not installed, and callers are expected to fall back to the
+pure-Python implementations.
+"""
+import numpy as np
+from numba import get_num_threads, njit, prange, set_num_threads
+
+from polygon_point_pip import EPS, _as_poly_array
+
+
+@njit(cache=True, fastmath=True)
+def cross_product(ox, oy, ax, ay, bx, by):
+    """Scalar 2D cross product of vectors OA and OB (see polygon_point_pip)."""
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+# fastmath must stay off here: it lets LLVM reassociate the compensated
+# sum and drop the error term entirely.
+@njit(cache=True, fastmath=False)
+def _signed_area_n(poly, n):
+    if n == 0:
+        return 0.0
+    ox = poly[0, 0]
+    oy = poly[0, 1]
+    s = 0.0
+    c = 0.0
+    for i in range(n):
+        j = i + 1 if i + 1 < n else 0
+        x1 = poly[i, 0] - ox
+        y1 = poly[i, 1] - oy
+        x2 = poly[j, 0] - ox
+        y2 = poly[j, 1] - oy
+        y = (x1 * y2 - y1 * x2) - c
+        t = s + y
+        c = (t - s) - y
+        s = t
+    return s
+
+
+@njit(cache=True, fastmath=False)
+def signed_area(poly):
+    """Shoelace sum (twice the signed area) of an (n, 2) array.
+
+    Same origin shift and Kahan compensation as polygon_point_pip.signed_area.
+    """
+    return _signed_area_n(poly, poly.shape[0])
+
+
+@njit(cache=True, fastmath=True)
+def _orientation_is_ccw(poly, n):
+    """Return True when the first n vertices of poly are ordered CCW."""
+    area = _signed_area_n(poly, n)
+    # Treat near-zero area as non-degenerate CCW for consistency
+    if abs(area) <= EPS:
+        return True
+    return area > 0
+
+
+@njit(cache=True, fastmath=True)
+def _in_convex_polygon_n(x, y, poly, n):
+    if n < 3:
+        return False
+    is_ccw = _orientation_is_ccw(poly, n)
+    for i in range(n):
+        j = i + 1 if i + 1 < n else 0
+        s = cross_product(poly[i, 0], poly[i, 1], poly[j, 0], poly[j, 1], x, y)
+        if is_ccw:
+            if s < -EPS:
+                return False
+        else:
+            if s > EPS:
+                return False
+    return True
+
+
+@njit(cache=True, fastmath=True)
+def in_convex_polygon(x, y, poly):
+    """Half-plane test for a convex polygon given as an (n, 2) array."""
+    return _in_convex_polygon_n(x, y, poly, poly.shape[0])
+
+
+@njit(cache=True, fastmath=True)
+def is_point_in_triangle(x, y, ax, ay, bx, by, cx, cy):
+    """Return True if (x, y) lies inside triangle a-b-c (including edges)."""
+    area1 = cross_product(x, y, ax, ay, bx, by)
+    area2 = cross_product(x, y, bx, by, cx, cy)
+    area3 = cross_product(x, y, cx, cy, ax, ay)
+    # sign masks combined with | instead of short-circuit and/or, so the
+    # three tests compile to compares and ORs without branches
+    neg = (area1 < -EPS) | (area2 < -EPS) | (area3 < -EPS)
+    pos = (area1 > EPS) | (area2 > EPS) | (area3 > EPS)
+    return not (neg & pos)
+
+
+@njit(cache=True, fastmath=True)
+def _find_first_concavity_n(poly, n):
+    if n < 3:
+        return -1
+    # negate the cross products of CW polygons so one test covers both
+    # orientations and the loop body has no branch on is_ccw
+    sign = 1.0 if _orientation_is_ccw(poly, n) else -1.0
+    for i in range(n):
+        p = i - 1 if i > 0 else n - 1
+        q = i + 1 if i + 1 < n else 0
+        cross = cross_product(poly[p, 0], poly[p, 1], poly[i, 0], poly[i, 1],
+                              poly[q, 0], poly[q, 1])
+        if sign * cross < -EPS:
+            return i
+    return -1
+
+
+@njit(cache=True, fastmath=True)
+def find_first_concavity(poly):
+    """Index of the first concave vertex of an (n, 2) polygon, or -1."""
+    return _find_first_concavity_n(poly, poly.shape[0])
+
+
+@njit(cache=True, fastmath=True)
+def is_point_in_concave_polygon(x, y, poly):
+    """Concavity-triangle method, compiled.
+
+    Works on a private copy of the vertex array: concave vertices are
+    removed in place by shifting the tail down, so no per-iteration
+    allocation happens inside the elimination loop.
+    """
+    work = poly.copy()
+    n = work.shape[0]
+    while n >= 3:
+        idx = _find_first_concavity_n(work, n)
+        if idx == -1:
+            return _in_convex_polygon_n(x, y, work, n)
+
+        p = idx - 1 if idx > 0 else n - 1
+        q = idx + 1 if idx + 1 < n else 0
+        if is_point_in_triangle(x, y, work[p, 0], work[p, 1],
+                                work[idx, 0], work[idx, 1],
+                                work[q, 0], work[q, 1]):
+            return False
+
+        # Remove the concave vertex and continue
+        for k in range(idx, n - 1):
+            work[k, 0] = work[k + 1, 0]
+            work[k, 1] = work[k + 1, 1]
+        n -= 1
+    return False
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def is_point_in_polygon_ray(x, y, poly, eps=1e-9):
+    """Even-odd (ray-casting) test; True if inside or on the boundary.
+
+    poly should be a C-contiguous (n, 2) float64 array; point_in_polygon_ray
+    converts arbitrary vertex sequences.
+    """
+    n = poly.shape[0]
+    if n < 3:
+        return False
+
+    parity = 0
+    p1x = poly[n - 1, 0]
+    p1y = poly[n - 1, 1]
+    for i in range(n):
+        # walk edges (i - 1, i) so the next vertex is carried over in
+        # registers instead of being indexed with a wrap-around
+        p2x = poly[i, 0]
+        p2y = poly[i, 1]
+
+        # Check if point is exactly on the segment (inclusive boundary);
+        # the bbox test is cheap and rejects most edges before the cross
+        # product is formed
+        lo_x = p1x if p1x < p2x else p2x
+        hi_x = p2x if p1x < p2x else p1x
+        lo_y = p1y if p1y < p2y else p2y
+        hi_y = p2y if p1y < p2y else p1y
+        if lo_x - eps <= x <= hi_x + eps and lo_y - eps <= y <= hi_y + eps:
+            if abs((p2x - p1x) * (y - p1y) - (p2y - p1y) * (x - p1x)) <= eps:
+                return True
+
+        # the division needs the straddle guard; the parity update itself
+        # is an XOR of the comparison, which compiles to a select
+        if (p1y > y) ^ (p2y > y):
+            parity ^= x < p1x + (y - p1y) * (p2x - p1x) / (p2y - p1y)
+
+        p1x = p2x
+        p1y = p2y
+
+    return parity != 0
+
+
+def point_in_polygon_ray(point, polygon, eps=EPS):
+    """Compiled is_point_in_polygon_ray for a point and any vertex sequence.
+
+    Converts polygon to a contiguous float64 array (a no-op for arrays that
+    already are one) and calls the kernel; callers testing many points
+    against the same polygon should convert it once themselves.
+    """
+    poly = _as_poly_array(polygon)
+    x, y = point
+    return is_point_in_polygon_ray(float(x), float(y), poly, eps)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def polygon_mask_ray(poly, xs, ys):
+    """Ray-casting test of every grid point; returns a (len(ys), len(xs)) mask.
+
+    Releases the GIL so fills rendered on a worker thread do not stall the
+    main loop.
+    """
+    mask = np.zeros((ys.shape[0], xs.shape[0]), dtype=np.bool_)
+    for r in range(ys.shape[0]):
+        for c in range(xs.shape[0]):
+            mask[r, c] = is_point_in_polygon_ray(xs[c], ys[r], poly)
+    return mask
+
+
+# Integer path: pygame vertices and pixel coordinates are small ints, so
+# the crossing test can be done exactly in int64 with strict sign tests and
+# no EPS. Exact while every coordinate satisfies |c| < 2**30: differences
+# then stay below 2**31, each product below 2**62 and their difference
+# below 2**63. Larger coordinates can overflow int64.
+INT_COORD_LIMIT = 1 << 30
+
+
+@njit("boolean(int64, int64, int32[:, :])", cache=True)
+def is_point_in_polygon_ray_int(x, y, poly):
+    """Exact even-odd test for integer points and int32 (n, 2) vertices.
+
+    Same result as is_point_in_polygon_ray with eps=0: points on an edge
+    count as inside. All coordinates must be below INT_COORD_LIMIT in
+    absolute value.
+    """
+    n = poly.shape[0]
+    if n < 3:
+        return False
+
+    parity = False
+    for i in range(n):
+        j = i + 1 if i + 1 < n else 0
+        x1 = np.int64(poly[i, 0])
+        y1 = np.int64(poly[i, 1])
+        x2 = np.int64(poly[j, 0])
+        y2 = np.int64(poly[j, 1])
+
+        # d = (p - p1) x (p2 - p1): zero when p is on the edge's line
+        d = (x - x1) * (y2 - y1) - (y - y1) * (x2 - x1)
+        if d == 0 and min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2):
+            return True
+
+        # x < x1 + (y - y1) * (x2 - x1) / (y2 - y1), multiplied through by
+        # (y2 - y1), whose sign flips the comparison. With no division the
+        # whole update is branchless: d != 0 whenever the edge straddles y
+        # (d == 0 there means on the edge, handled above), so the test is
+        # just whether d's sign matches the edge direction
+        parity ^= ((y1 > y) ^ (y2 > y)) & ((d < 0) == (y2 > y1))
+
+    return parity
+
+
+@njit("boolean[:, :](int32[:, :], int64[:], int64[:])", cache=True, nogil=True)
+def polygon_mask_ray_int(poly, xs, ys):
+    """Integer counterpart of polygon_mask_ray."""
+    mask = np.zeros((ys.shape[0], xs.shape[0]), dtype=np.bool_)
+    for r in range(ys.shape[0]):
+        for c in range(xs.shape[0]):
+            mask[r, c] = is_point_in_polygon_ray_int(xs[c], ys[r], poly)
+    return mask
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def points_mask_ray(poly, px, py, eps=1e-9):
+    """Ray-casting test of the points (px[k], py[k]); returns a (k,) mask."""
+    mask = np.zeros(px.shape[0], dtype=np.bool_)
+    for k in range(px.shape[0]):
+        mask[k] = is_point_in_polygon_ray(px[k], py[k], poly, eps)
+    return mask
+
+
+@njit(cache=True, fastmath=True, parallel=True, nogil=True)
+def points_mask_ray_parallel(poly, px, py, eps=1e-9):
+    """points_mask_ray with the points split across numba's thread pool."""
+    mask = np.zeros(px.shape[0], dtype=np.bool_)
+    for k in prange(px.shape[0]):
+        mask[k] = is_point_in_polygon_ray(px[k], py[k], poly, eps)
+    return mask
+
+
+# Below this many points points_in_polygon_ray stays on the serial kernel:
+# waking the thread pool costs more than the work it would share.
+PARALLEL_MIN_POINTS = 1024
+
+
+def points_in_polygon_ray(points, polygon, eps=EPS, num_threads=None):
+    """Compiled batch even-odd test of an (m, 2) array of points.
+
+    Same results as polygon_point_pip.points_in_polygon_ray. Batches of at
+    least PARALLEL_MIN_POINTS points run on numba's thread pool, using
+    num_threads threads when given (numba's default is one per core).
+
+    The default workqueue threading layer does not allow parallel kernels
+    to be launched from several threads at once; call this from one
+    thread, or install TBB or OpenMP for numba.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    px = np.ascontiguousarray(pts[:, 0])
+    py = np.ascontiguousarray(pts[:, 1])
+    poly = _as_poly_array(polygon)
+    if len(pts) < PARALLEL_MIN_POINTS:
+        return points_mask_ray(poly, px, py, eps)
+    if num_threads is None:
+        return points_mask_ray_parallel(poly, px, py, eps)
+    previous = get_num_threads()
+    set_num_threads(num_threads)
+    try:
+        return points_mask_ray_parallel(poly, px, py, eps)
+    finally:
+        set_num_threads(previous)
+
+
+@njit("boolean[:](int32[:, :], int64[:], int64[:])", cache=True, nogil=True)
+def points_mask_ray_int(poly, px, py):
+    """Integer counterpart of points_mask_ray."""
+    mask = np.zeros(px.shape[0], dtype=np.bool_)
+    for k in range(px.shape[0]):
+        mask[k] = is_point_in_polygon_ray_int(px[k], py[k], poly)
+    return mask
@@ -0,0 +1,66 @@
+"""ctypes wrapper around the batch PIP kernel in pip_simd.c.
+
+The shared library is not built automatically; compile it next to this
+file with
+
+    cc -O3 -shared -fPIC -o _pip_simd.so pip_simd.c
+
+(add -fopenmp to spread large batches over all cores).
+Importing this module raises ImportError when the library is missing, so
+callers can fall back to the NumPy implementation. The kernel picks its
+AVX2/FMA path at run time; HAVE_AVX2 reports whether it is in use.
+"""
+import ctypes
+import os
+
+import numpy as np
+
+from polygon_point_pip import EPS, _as_poly_array
+
+_LIB_NAMES = ("_pip_simd.so", "_pip_simd.dylib", "_pip_simd.dll")
+
+
+def _load_library():
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _LIB_NAMES:
+        path = os.path.join(here, name)
+        if os.path.exists(path):
+            try:
+                return ctypes.CDLL(path)
+            except OSError as e:
+                raise ImportError(f"cannot load {path}: {e}") from e
+    raise ImportError("pip_simd shared library not built (see pip_simd.py)")
+
+
+_lib = _load_library()
+
+_double_p = ctypes.POINTER(ctypes.c_double)
+_lib.pip_simd_has_avx2.restype = ctypes.c_int
+_lib.pip_simd_has_avx2.argtypes = []
+_lib.point_in_polygon_batch.restype = None
+_lib.point_in_polygon_batch.argtypes = [
+    _double_p, _double_p, ctypes.c_long,
+    _double_p, ctypes.c_long, ctypes.c_double,
+    ctypes.POINTER(ctypes.c_ubyte),
+]
+
+HAVE_AVX2 = bool(_lib.pip_simd_has_avx2())
+
+
+def point_in_polygon_batch(points, polygon, eps=EPS):
+    """Test an (N, 2) array of points against one polygon in a single call.
+
+    Returns an (N,) boolean array with the same results as
+    is_point_in_polygon_ray (boundary counts as inside).
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    xs = np.ascontiguousarray(pts[:, 0])
+    ys = np.ascontiguousarray(pts[:, 1])
+    poly = _as_poly_array(polygon)
+    out = np.empty(len(pts), dtype=np.uint8)
+    _lib.point_in_polygon_batch(
+        xs.ctypes.data_as(_double_p), ys.ctypes.data_as(_double_p), len(pts),
+        poly.ctypes.data_as(_double_p), len(poly), eps,
+        out.ctypes.data_as(ctypes.POINTER(ctypes.c_ubyte)),
+    )
+    return out.view(bool)
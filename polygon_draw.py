@@ -1,8 +1,25 @@
+import math
 import pygame
 import sys
 import threading
-from typing import List, Tuple
-from polygon_point_pip import is_point_in_concave_polygon, is_point_in_polygon_ray, trace_concavity_removal, trace_by_ear_clipping
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from pip_batch import points_in_polygon
+from polygon_point_pip import EPS, PreparedPolygon, point_in_polygons_csr, prepare_concave, prepare_polygon, trace_concavity_removal
+
+# Exact integer mask kernels for pixel coordinates when numba is installed;
+# everything else goes through pip_batch's backend choice.
+try:
+    from pip_numba import polygon_mask_ray_int as _polygon_mask_compiled_int
+    from pip_numba import points_mask_ray_int as _points_mask_compiled_int
+    from pip_numba import INT_COORD_LIMIT
+except ImportError:
+    _polygon_mask_compiled_int = None
+    _points_mask_compiled_int = None
+
+# Side, in samples, of the square tiles classified by polygon_tiled_mask.
+TILE_SIZE = 16
 
 WIDTH, HEIGHT = 1000, 700
 BG_COLOR = (30, 30, 30)
@@ -18,6 +35,71 @@ DEFAULT_POLYGON_STR = (
 )
 
 
+class PolygonStore:
+    """Structure-of-arrays storage for closed polygons.
+
+    All vertices live in two contiguous int32 arrays, xs and ys; polygon i
+    owns the slice offsets[i]:offsets[i + 1] (CSR layout). bboxes holds one
+    (min_x, min_y, max_x, max_y) row per polygon. Indexing returns the
+    polygon as a list of (x, y) tuples, built once per polygon, for the
+    APIs (pygame.draw, the trace helpers) that need one.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._xs = np.empty(capacity, dtype=np.int32)
+        self._ys = np.empty(capacity, dtype=np.int32)
+        self.offsets = np.zeros(1, dtype=np.intp)
+        self.bboxes = np.empty((0, 4), dtype=np.int32)
+        self._lists: List[List[Tuple[int, int]]] = []
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self._xs[:self.offsets[-1]]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self._ys[:self.offsets[-1]]
+
+    def append_poly(self, pts) -> None:
+        pts = np.asarray(pts, dtype=np.int32).reshape(-1, 2)
+        start = self.offsets[-1]
+        end = start + len(pts)
+        if end > len(self._xs):
+            capacity = max(end, 2 * len(self._xs))
+            self._xs = np.resize(self._xs, capacity)
+            self._ys = np.resize(self._ys, capacity)
+        self._xs[start:end] = pts[:, 0]
+        self._ys[start:end] = pts[:, 1]
+        self.offsets = np.append(self.offsets, end)
+        bbox = np.concatenate((pts.min(axis=0), pts.max(axis=0))) if len(pts) else np.zeros(4, dtype=np.int32)
+        self.bboxes = np.vstack((self.bboxes, bbox))
+        self._lists.append([(int(x), int(y)) for x, y in pts])
+
+    def clear(self) -> None:
+        self.offsets = np.zeros(1, dtype=np.intp)
+        self.bboxes = np.empty((0, 4), dtype=np.int32)
+        self._lists.clear()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> List[Tuple[int, int]]:
+        return self._lists[i]
+
+    def __iter__(self):
+        return iter(self._lists)
+
+    def contains_point(self, point) -> np.ndarray:
+        """Return a (len(self),) boolean array: which polygons contain point."""
+        return point_in_polygons_csr(point, self.xs, self.ys, self.offsets, bboxes=self.bboxes)
+
+    def write(self, f) -> None:
+        """Write one 'x,y;x,y;...' line per polygon, straight from the arrays."""
+        xs, ys = self.xs.tolist(), self.ys.tolist()
+        for a, b in zip(self.offsets[:-1], self.offsets[1:]):
+            f.write(";".join(f"{x},{y}" for x, y in zip(xs[a:b], ys[a:b])) + "\n")
+
+
 def parse_polygon_from_string(s: str):
     """Parse a semicolon-separated list of x,y pairs into a list of tuples."""
     pts = []
@@ -33,60 +115,286 @@ def parse_polygon_from_string(s: str):
     return pts
 
 
+# Fonts by size and rendered text surfaces by (text, color, size): the help
+# lines are constant and the counters rarely change, so most frames only blit.
+_font_cache: Dict[int, pygame.font.Font] = {}
+_text_cache: Dict[Tuple[str, Tuple[int, ...], int], pygame.Surface] = {}
+# Drop all rendered text once this many distinct strings have been cached.
+TEXT_CACHE_LIMIT = 256
+
+
 def draw_text(surface, text, pos, color=(220, 220, 220), font_size=18):
-    font = pygame.font.SysFont(None, font_size)
-    img = font.render(text, True, color)
+    key = (text, tuple(color), font_size)
+    img = _text_cache.get(key)
+    if img is None:
+        font = _font_cache.get(font_size)
+        if font is None:
+            font = _font_cache[font_size] = pygame.font.SysFont(None, font_size)
+        if len(_text_cache) >= TEXT_CACHE_LIMIT:
+            _text_cache.clear()
+        img = _text_cache[key] = font.render(text, True, color)
     surface.blit(img, pos)
 
 
-def draw_filled_polygon_by_sampling(surface, polygon: List[Tuple[int, int]], color: Tuple[int, int, int], sample_step: int = 1) -> None:
-    """Fill a polygon by testing each point in its bounding box with a PIP test.
+def _fits_int_kernel(*arrays):
+    """True when all arrays are integer and within the exact integer kernel's range."""
+    return all(
+        a.dtype.kind in "iu" and (a.size == 0 or int(np.abs(a).max()) < INT_COORD_LIMIT)
+        for a in arrays
+    )
+
+
+def polygon_points_mask(polygon, px, py):
+    """Return a (len(px),) boolean mask: which points (px[k], py[k]) are inside.
+
+    Integer polygons and points within INT_COORD_LIMIT (pygame pixels) use
+    numba's exact integer kernel; anything else goes to
+    pip_batch.points_in_polygon.
+    """
+    poly_arr = np.asarray(polygon).reshape(-1, 2)
+    px = np.asarray(px).ravel()
+    py = np.asarray(py).ravel()
+    if _points_mask_compiled_int is not None and _fits_int_kernel(poly_arr, px, py):
+        return _points_mask_compiled_int(poly_arr.astype(np.int32), px.astype(np.int64), py.astype(np.int64))
+    points = np.column_stack((px, py)).astype(np.float64)
+    return points_in_polygon(points, poly_arr.astype(np.float64), EPS)
+
+
+def polygon_sampling_mask(polygon, xs, ys):
+    """Return a (len(ys), len(xs)) boolean mask of grid points inside polygon.
+
+    Same kernels as polygon_points_mask; the integer kernel walks the grid
+    directly instead of flattening it into a point list first.
+    """
+    poly_arr = np.asarray(polygon).reshape(-1, 2)
+    xs = np.asarray(xs)
+    ys = np.asarray(ys)
+    if _polygon_mask_compiled_int is not None and _fits_int_kernel(poly_arr, xs, ys):
+        return _polygon_mask_compiled_int(poly_arr.astype(np.int32), xs.astype(np.int64), ys.astype(np.int64))
+    X, Y = np.meshgrid(xs, ys)
+    return polygon_points_mask(polygon, X.ravel(), Y.ravel()).reshape(len(ys), len(xs))
+
+
+def _edge_table(poly_arr):
+    """Return (ymin, ymax, x_at_ymin, dx/dy) arrays, one entry per edge."""
+    x1, y1 = poly_arr[:, 0], poly_arr[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    ey0 = np.minimum(y1, y2)
+    ey1 = np.maximum(y1, y2)
+    ex0 = np.where(y1 <= y2, x1, x2)
+    # horizontal edges are never active, so their inf/nan slope is unused
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_slope = (x2 - x1) / (y2 - y1)
+    return ey0, ey1, ex0, inv_slope
+
+
+def _scanline_fill(region, poly_arr, min_x, min_y, step, color):
+    """Fill the even-odd spans of polygon into region, one scanline at a time.
+
+    region is the pixels3d view pixels[min_x::step, min_y::step] clipped to
+    the bounding box; column c / row r correspond to pixel
+    (min_x + c*step, min_y + r*step). An edge is active on scanline y when
+    ymin <= y < ymax, the same straddle rule as is_point_in_polygon_ray, so
+    pixels between consecutive pairs of sorted crossings are inside. That
+    rule never reaches horizontal edges or the y == ymax ends of the others,
+    so the boundary points of every edge that touches the scanline are
+    filled as well, as the PIP test counts them inside.
+    """
+    ey0, ey1, ex0, inv_slope = _edge_table(poly_arr)
+    x1, x2 = poly_arr[:, 0], np.roll(poly_arr[:, 0], -1)
+    lo_x, hi_x = np.minimum(x1, x2), np.maximum(x1, x2)
+    n_cols, n_rows = region.shape[0], region.shape[1]
+    for row in range(n_rows):
+        y = min_y + row * step
+        spans = []
+        active = np.where((ey0 <= y) & (ey1 > y))[0]
+        if len(active) >= 2:
+            xs = np.sort(ex0[active] + (y - ey0[active]) * inv_slope[active])
+            spans.append((xs[0::2], xs[1::2]))
+        # boundary: the whole of a horizontal edge on this line, else the
+        # single point where the edge meets it
+        touching = np.where((ey0 - EPS <= y) & (y <= ey1 + EPS))[0]
+        if len(touching):
+            flat = ey0[touching] == ey1[touching]
+            with np.errstate(invalid="ignore"):
+                bx = ex0[touching] + (np.clip(y, ey0[touching], ey1[touching]) - ey0[touching]) * inv_slope[touching]
+            spans.append((np.where(flat, lo_x[touching], bx) - EPS, np.where(flat, hi_x[touching], bx) + EPS))
+        for xa, xb in spans:
+            # span [xa, xb] (boundary inclusive, like the PIP test) ->
+            # columns ceil((xa - min_x) / step) .. floor((xb - min_x) / step)
+            starts = np.clip(np.ceil((xa - min_x) / step), 0, n_cols).astype(int)
+            ends = np.clip(np.floor((xb - min_x) / step) + 1, 0, n_cols).astype(int)
+            for a, b in zip(starts, ends):
+                if b > a:
+                    region[a:b, row] = color
+
+
+def polygon_tiled_mask(polygon, xs, ys, tile: int = TILE_SIZE):
+    """Same mask as polygon_sampling_mask, computed tile by tile.
+
+    The grid is split into tile x tile blocks. A block whose bounds no edge's
+    bounding box reaches cannot contain part of the boundary, so it is
+    entirely inside or entirely outside and its first sample decides it;
+    those blocks are filled (or skipped) wholesale. Only the blocks an edge
+    may cross are tested per sample, which for large polygons is a small
+    fraction of the bounding box.
+    """
+    xs = np.asarray(xs)
+    ys = np.asarray(ys)
+    h, w = len(ys), len(xs)
+    if h == 0 or w == 0:
+        return np.zeros((h, w), dtype=bool)
+
+    poly_arr = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    px, py = poly_arr[:, 0], poly_arr[:, 1]
+    px1, py1 = np.roll(px, -1), np.roll(py, -1)
+    edge_x0, edge_x1 = np.minimum(px, px1) - EPS, np.maximum(px, px1) + EPS
+    edge_y0, edge_y1 = np.minimum(py, py1) - EPS, np.maximum(py, py1) + EPS
+
+    # tile bounds in coordinates: first and last sample of each block
+    col_starts = np.arange(0, w, tile)
+    row_starts = np.arange(0, h, tile)
+    tile_x0 = xs[col_starts]
+    tile_x1 = xs[np.minimum(col_starts + tile, w) - 1]
+    tile_y0 = ys[row_starts]
+    tile_y1 = ys[np.minimum(row_starts + tile, h) - 1]
 
-    This is intentionally simple and brute-force: it iterates over the integer
-    coordinates inside the polygon's bounding box and sets pixels where the
-    provided point-in-polygon test returns True.
+    # (rows, cols) grid of "some edge's bbox overlaps this tile"
+    touch_x = (edge_x0 <= tile_x1[:, None]) & (tile_x0[:, None] <= edge_x1)   # (cols, E)
+    touch_y = (edge_y0 <= tile_y1[:, None]) & (tile_y0[:, None] <= edge_y1)   # (rows, E)
+    mixed = np.logical_or.reduce(touch_y[:, None, :] & touch_x[None, :, :], axis=-1)
+
+    # uniform tiles take the value of their first sample
+    first = polygon_sampling_mask(polygon, xs[col_starts], ys[row_starts])
+    full = first & ~mixed
+    mask = np.repeat(np.repeat(full, tile, axis=0), tile, axis=1)[:h, :w]
+
+    # the samples of all mixed tiles are tested together in one batch
+    rows, cols = np.nonzero(np.repeat(np.repeat(mixed, tile, axis=0), tile, axis=1)[:h, :w])
+    if len(rows):
+        mask[rows, cols] = polygon_points_mask(polygon, xs[cols], ys[rows])
+    return mask
+
+
+def draw_filled_polygon_by_sampling(surface, polygon: List[Tuple[int, int]], color: Tuple[int, int, int], sample_step: int = 1,
+                                    prepared: Optional[PreparedPolygon] = None) -> None:
+    """Fill a polygon without pygame's polygon fill.
+
+    Simple polygons are drawn from their ear-clipping triangles. Anything
+    else is rasterized with an even-odd scanline fill: for each sampled row
+    the edge crossings are computed and sorted and the spans between them
+    are written, so only interior pixels are touched.
 
     Args:
         surface: Pygame surface to draw onto.
         polygon: list of (x, y) vertex tuples.
         color: RGB color tuple.
         sample_step: step in pixels for sampling (1 = every pixel, >1 = faster/coarser).
+        prepared: cached data for polygon from prepare_polygon(); when given,
+            its triangulation is reused instead of ear-clipping every call.
     """
     if not polygon:
         return
 
     xs = [p[0] for p in polygon]
     ys = [p[1] for p in polygon]
-    min_x = max(min(xs), 0)
-    max_x = max(min(max(xs), surface.get_width() - 1), min_x)
-    min_y = max(min(ys), 0)
-    max_y = max(min(max(ys), surface.get_height() - 1), min_y)
-
-    # If polygon appears simple, attempt ear-clipping triangulation and draw
-    # triangles directly (guarantees simple intermediate geometry and is faster
-    # than per-pixel sampling). If ear-clipping fails (degenerate or
-    # self-intersecting polygon), fall back to robust per-pixel sampling using
-    # a ray-casting PIP test.
+    min_x = max(math.floor(min(xs)), 0)
+    max_x = max(min(math.ceil(max(xs)), surface.get_width() - 1), min_x)
+    min_y = max(math.floor(min(ys)), 0)
+    max_y = max(min(math.ceil(max(ys)), surface.get_height() - 1), min_y)
+
+    # If polygon appears simple, use its ear-clipping triangulation and draw
+    # triangles directly (guarantees simple intermediate geometry). If
+    # ear-clipping fails (degenerate or self-intersecting polygon), fall back
+    # to the even-odd scanline fill, which matches the ray-casting PIP test.
+    if prepared is not None:
+        triangles = prepared.triangles
+    else:
+        try:
+            triangles = prepare_concave(polygon)
+        except Exception:
+            triangles = None
+    if triangles is not None:
+        for tri in triangles:
+            # draw filled triangle using pygame's polygon fill
+            pygame.draw.polygon(surface, color, tri)
+        return
+
+    # fall back: scanline rasterization of the even-odd interior (robust for
+    # complex polygons), writing whole spans through a pixels3d view.
+    # Lock once for the whole write; the view must be released (deleted)
+    # before the surface is unlocked and later flipped.
+    poly_arr = np.asarray(polygon, dtype=np.float64)
+    surface.lock()
     try:
-        trace = trace_by_ear_clipping(polygon)
-        # if trace produced any steps, extract triangles and draw them
-        if trace:
-            for step in trace:
-                tri = step.get("triangle")
-                if tri and len(tri) == 3:
-                    # draw filled triangle using pygame's polygon fill
-                    pygame.draw.polygon(surface, color, tri)
-            return
-    except Exception:
-        # fall back to sampling
-        pass
-
-    # fall back: per-pixel sampling using ray-casting PIP (robust for complex polygons)
-    set_at = surface.set_at
-    for y in range(min_y, max_y + 1, sample_step):
-        for x in range(min_x, max_x + 1, sample_step):
-            if is_point_in_polygon_ray((x, y), polygon):
-                set_at((x, y), color)
+        pixels = pygame.surfarray.pixels3d(surface)
+        region = pixels[min_x:max_x + 1:sample_step, min_y:max_y + 1:sample_step]
+        _scanline_fill(region, poly_arr, min_x, min_y, sample_step, np.asarray(color[:3], dtype=np.uint8))
+        del region, pixels
+    finally:
+        surface.unlock()
+
+
+def render_sampled_fill(polygon: List[Tuple[int, int]], color: Tuple[int, int, int], sample_step: int = 1):
+    """Rasterize a polygon fill into its own bbox-sized RGBA surface.
+
+    Uses the tiled vectorized PIP mask, touches no shared surface and can
+    therefore run on a worker thread. Returns (surface, (min_x, min_y)):
+    blit the surface at that position. Pixels outside the polygon (and
+    between samples when sample_step > 1) are fully transparent.
+    """
+    xs = [p[0] for p in polygon]
+    ys = [p[1] for p in polygon]
+    min_x, max_x = math.floor(min(xs)), math.ceil(max(xs))
+    min_y, max_y = math.floor(min(ys)), math.ceil(max(ys))
+    w, h = max_x - min_x + 1, max_y - min_y + 1
+    mask = polygon_tiled_mask(
+        polygon,
+        np.arange(min_x, max_x + 1, sample_step),
+        np.arange(min_y, max_y + 1, sample_step),
+    )
+    buf = np.zeros((h, w, 4), dtype=np.uint8)
+    buf[::sample_step, ::sample_step][mask] = (*color[:3], 255)
+    return pygame.image.frombuffer(buf.tobytes(), (w, h), "RGBA"), (min_x, min_y)
+
+
+class FillRenderer:
+    """Renders sampled polygon fills on a worker thread.
+
+    Each (polygon, color, sample_step) fill is submitted once; get()
+    returns the finished (surface, pos) or None while it is still being
+    rendered, so the main loop never waits on the rasterization. Fills are
+    keyed by the polygon's index rather than its vertices, so a lookup does
+    not hash the whole vertex list; call clear() whenever indices are
+    reused.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+
+    def get(self, index, polygon, color, sample_step):
+        key = (index, tuple(color), sample_step)
+        future = self._futures.get(key)
+        if future is None:
+            future = self._executor.submit(render_sampled_fill, list(polygon), color, sample_step)
+            self._futures[key] = future
+        if not future.done():
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def clear(self):
+        """Drop all cached fills (and cancel the ones not started yet)."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+
+    def shutdown(self):
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 def lighten_color(color: Tuple[int, int, int], factor: float = 0.5) -> Tuple[int, int, int]:
@@ -108,11 +416,22 @@ def main():
     pygame.display.set_caption("Polygon Drawer - left click to add, right click or Enter to close")
     clock = pygame.time.Clock()
 
-    polygons: List[List[Tuple[int, int]]] = []
+    polygons = PolygonStore()
+    # prepared[i] caches the point-independent PIP data of polygons[i]
+    prepared: List[PreparedPolygon] = []
+
+    def add_polygon(poly):
+        polygons.append_poly(poly)
+        prepared.append(prepare_polygon(poly))
+
+    def clear_polygons():
+        polygons.clear()
+        prepared.clear()
+
     # ensure default test polygon is present first
     default_poly = parse_polygon_from_string(DEFAULT_POLYGON_STR)
     if default_poly:
-        polygons.append(default_poly)
+        add_polygon(default_poly)
     current: List[Tuple[int, int]] = []
 
     running = True
@@ -126,6 +445,8 @@ def main():
     # fill mode: False => pygame.draw.polygon, True => sampled PIP fill
     use_sampling_fill = False
     sample_step = 1
+    # sampled fills are rasterized off the main thread and blitted when ready
+    fill_renderer = FillRenderer()
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -135,20 +456,21 @@ def main():
                     current.append(event.pos)
                 elif event.button == 3:  # right click -> close polygon if possible
                     if len(current) >= 3:
-                        polygons.append(list(current))
+                        add_polygon(current)
                     current.clear()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
                 elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
                     if len(current) >= 3:
-                        polygons.append(list(current))
+                        add_polygon(current)
                     current.clear()
                 elif event.key == pygame.K_BACKSPACE:
                     if current:
                         current.pop()
                 elif event.key == pygame.K_c:
-                    polygons.clear()
+                    clear_polygons()
+                    fill_renderer.clear()
                     current.clear()
                 elif event.key == pygame.K_d:
                     # toggle debug trace mode for the first/default polygon
@@ -177,8 +499,7 @@ def main():
                 elif event.key == pygame.K_s:
                     try:
                         with open("polygons.txt", "w") as f:
-                            for poly in polygons:
-                                f.write(";".join(f"{x},{y}" for x, y in poly) + "\n")
+                            polygons.write(f)
                         print("Saved polygons to polygons.txt")
                     except Exception as e:
                         print("Failed to save:", e)
@@ -191,41 +512,53 @@ def main():
                 elif event.key in (pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_EQUALS):
                     # decrease sample step to increase quality (min 1)
                     sample_step = max(1, sample_step - 1)
+                    fill_renderer.clear()
                 elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
                     # increase sample step to lower quality and speed up
                     sample_step = sample_step + 1
+                    fill_renderer.clear()
 
         # draw
         screen.fill(BG_COLOR)
 
         # draw filled polygons
         mouse_pos = pygame.mouse.get_pos()
-        for poly in polygons:
+        # one ray-cast pass over the edges of every polygon whose bbox
+        # contains the mouse (handles self-intersections)
+        try:
+            hovered = polygons.contains_point(mouse_pos)
+        except Exception:
+            hovered = np.zeros(len(polygons), dtype=bool)
+        # For the first polygon, optionally use the research PIP routine
+        if use_research_pip_for_default and len(polygons):
+            try:
+                hovered[0] = prepared[0].compiled(mouse_pos)
+            except Exception:
+                hovered[0] = False
+        for idx, (poly, inside) in enumerate(zip(polygons, hovered)):
             if len(poly) >= 3:
-                # Use sampling-based fill when polygon area is small-to-medium.
-                # For very large polygons this is slow; sample_step can be
-                # increased to speed up the operation at the cost of quality.
                 # If the mouse is inside this polygon, draw with a lighter fill.
-                # Use the ray-casting test which handles self-intersections
-                # For the first polygon, optionally use the research PIP routine
-                try:
-                    if use_research_pip_for_default and polygons.index(poly) == 0:
-                        inside = is_point_in_concave_polygon(mouse_pos, poly)
-                    else:
-                        inside = is_point_in_polygon_ray(mouse_pos, poly)
-                except Exception:
-                    inside = False
-
                 fill_color = FILL_COLOR
                 if inside:
                     fill_color = lighten_color(FILL_COLOR, factor=0.6)
 
-                if use_sampling_fill:
-                    # sampled PIP fill (slower but robust for complex polygons)
-                    draw_filled_polygon_by_sampling(screen, poly, fill_color, sample_step=sample_step)
-                else:
-                    # Use pygame's native polygon fill for speed and simplicity.
+                if not use_sampling_fill:
+                    # Use pygame's native polygon fill for speed and simplicity
                     pygame.draw.polygon(screen, fill_color, poly)
+                elif prepared[idx].triangles is not None:
+                    # simple polygon: draw its cached ear-clipping triangles
+                    draw_filled_polygon_by_sampling(screen, poly, fill_color, sample_step, prepared=prepared[idx])
+                else:
+                    # Self-intersecting polygons get the sampled even-odd fill,
+                    # rasterized on a worker thread so a large polygon only
+                    # delays its own fill (sample_step trades quality for
+                    # speed); until it is ready they are scanline-filled here.
+                    fill = fill_renderer.get(idx, poly, fill_color, sample_step)
+                    if fill is not None:
+                        fill_surface, fill_pos = fill
+                        screen.blit(fill_surface, fill_pos)
+                    else:
+                        draw_filled_polygon_by_sampling(screen, poly, fill_color, sample_step, prepared=prepared[idx])
                 pygame.draw.polygon(screen, LINE_COLOR, poly, width=2)
 
         # current polygon: lines and points
@@ -262,6 +595,7 @@ def main():
         pygame.display.flip()
         clock.tick(60)
 
+    fill_renderer.shutdown()
     pygame.quit()
     sys.exit()
 
@@ -1,3 +1,10 @@
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+
 
 def cross_product(o, a, b):
     """Compute the 2D cross product (signed area) of vectors OA and OB.
@@ -21,44 +28,148 @@ def side(px, p1, p2):
     # Reuse cross_product for clarity: (p2 - p1) x (px - p1)
     return cross_product(p1, p2, px)
 
-def in_convex_polygon(point, polygon):
+def _as_poly_array(polygon):
+    """Return polygon as a C-contiguous (n, 2) float64 array.
+
+    x is column 0 and y column 1. Arrays that already have that layout are
+    returned as is (no copy), so callers can convert once and pass the
+    result down to the vectorized and compiled routines. Raises ValueError
+    for anything that is not a sequence of (x, y) pairs (an empty polygon
+    becomes a (0, 2) array).
+    """
+    arr = np.ascontiguousarray(polygon, dtype=np.float64)
+    if arr.ndim == 2 and arr.shape[1] == 2:
+        return arr
+    if arr.size == 0:
+        return arr.reshape(0, 2)
+    raise ValueError(f"polygon must have shape (n, 2), got {arr.shape}")
+
+def signed_area(polygon):
+    """Return the shoelace sum of polygon: twice its signed area.
+
+    Positive for counter-clockwise order, negative for clockwise. The sign
+    is what orientation tests rely on, so it is kept reliable for large or
+    float-valued coordinates: vertices are taken relative to the first one
+    (the sum is translation invariant, and the products stay small), and
+    the terms are accumulated with Kahan compensated summation.
+
+    An (n, 2) ndarray (see _as_poly_array) is summed in one vector
+    expression and added with math.fsum instead.
+    """
+    n = len(polygon)
+    if n == 0:
+        return 0.0
+    if isinstance(polygon, np.ndarray):
+        rel = _as_poly_array(polygon) - polygon[0]
+        x, y = rel[:, 0], rel[:, 1]
+        # fsum over a list: iterating the ndarray would box every element
+        return math.fsum((x[:-1] * y[1:] - y[:-1] * x[1:]).tolist())
+    ox, oy = polygon[0]
+    # the first vertex repeated at the end closes the ring, so the edge
+    # loop needs no wrap-around index
+    ring = list(polygon)
+    ring.append(polygon[0])
+    s = 0.0
+    c = 0.0
+    for i in range(n):
+        x1, y1 = ring[i]
+        x2, y2 = ring[i + 1]
+        x1 -= ox
+        y1 -= oy
+        x2 -= ox
+        y2 -= oy
+        y = (x1 * y2 - y1 * x2) - c
+        t = s + y
+        c = (t - s) - y
+        s = t
+    return s
+
+def _area_is_ccw(area):
+    """Orientation from a signed_area() value; near-zero area counts as CCW."""
+    return True if abs(area) <= EPS else area > 0
+
+def _orientation_is_ccw(polygon):
+    return _area_is_ccw(signed_area(polygon))
+
+# Vertex count from which in_convex_polygon runs its side tests on a list
+# polygon as NumPy array expressions; below it converting the list costs
+# more than the loop. ndarray input always takes the array path.
+CONVEX_VECTORIZE_MIN = 512
+
+def in_convex_polygon(point, polygon, is_ccw=None):
     """Half-plane method for testing a point inside a convex polygon.
 
     Works for polygons ordered clockwise or counter-clockwise. Returns True
     if the point lies inside or on the boundary of the convex polygon.
+    Callers that already know the orientation can pass is_ccw to skip the
+    signed-area pass.
+
+    For an ndarray, or a list of at least CONVEX_VECTORIZE_MIN vertices,
+    the polygon is converted once to an (n, 2) float64 array, and the
+    bounding-box reject, orientation and all n side tests are computed as
+    whole-array expressions instead of a per-edge Python loop.
     """
-    if len(polygon) < 3:
+    n = len(polygon)
+    if n < 3:
         return False
-
-    # Determine polygon orientation via signed area
-    area = 0.0
-    for i in range(len(polygon)):
-        x1, y1 = polygon[i]
-        x2, y2 = polygon[(i + 1) % len(polygon)]
-        area += (x1 * y2 - y1 * x2)
-
-    # Treat near-zero area as non-degenerate CCW for consistency
-    if abs(area) <= EPS:
-        is_ccw = True
-    else:
-        is_ccw = area > 0
-
-    # For CCW polygon the point must be to the left (side >= 0) of every edge
-    # For CW polygon the point must be to the right (side <= 0) of every edge
-    for i in range(len(polygon)):
-        p1 = polygon[i]
-        p2 = polygon[(i + 1) % len(polygon)]
-        s = side(point, p1, p2)
+    # Triangles and quads are the common case in pygame scenes; both skip
+    # the array setup: a triangle is is_point_in_triangle, and a quad gets
+    # its four side tests unrolled (its shoelace sum is the cross product
+    # of the diagonals)
+    if n == 3:
+        return is_point_in_triangle(point, polygon[0], polygon[1], polygon[2])
+    if n == 4:
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = polygon
+        px, py = point
+        if is_ccw is None:
+            is_ccw = _area_is_ccw((x2 - x0) * (y3 - y1) - (y2 - y0) * (x3 - x1))
+        sign = 1.0 if is_ccw else -1.0
+        return (sign * ((x1 - x0) * (py - y0) - (y1 - y0) * (px - x0)) >= -EPS
+                and sign * ((x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)) >= -EPS
+                and sign * ((x3 - x2) * (py - y2) - (y3 - y2) * (px - x2)) >= -EPS
+                and sign * ((x0 - x3) * (py - y3) - (y0 - y3) * (px - x3)) >= -EPS)
+
+    px, py = point
+    if n < CONVEX_VECTORIZE_MIN and not isinstance(polygon, np.ndarray):
+        if is_ccw is None:
+            is_ccw = _orientation_is_ccw(polygon)
+        # For CCW polygon the point must be to the left (side >= 0) of every edge
+        # For CW polygon the point must be to the right (side <= 0) of every edge
+        ring = list(polygon)
+        ring.append(polygon[0])
         if is_ccw:
-            # point must be left of edge: allow small negative tolerance
-            if s < -EPS:
-                return False
+            for i in range(n):
+                (x1, y1), (x2, y2) = ring[i], ring[i + 1]
+                if (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1) < -EPS:
+                    return False
         else:
-            # CW polygon: point must be right of edge
-            if s > EPS:
-                return False
+            for i in range(n):
+                (x1, y1), (x2, y2) = ring[i], ring[i + 1]
+                if (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1) > EPS:
+                    return False
+        return True
+
+    poly = _as_poly_array(polygon)
+    x1 = poly[:, 0]
+    y1 = poly[:, 1]
+    # the box is a by-product of the array, so a far-away point is
+    # rejected before the orientation pass
+    if (px < x1.min() - EPS or px > x1.max() + EPS
+            or py < y1.min() - EPS or py > y1.max() + EPS):
+        return False
+    x2 = np.roll(x1, -1)
+    y2 = np.roll(y1, -1)
+
+    if is_ccw is None:
+        # Determine polygon orientation via signed area (the vectorized
+        # branch, since poly is already an array)
+        is_ccw = _area_is_ccw(signed_area(poly))
 
-    return True
+    # side(point, p1, p2) for every edge at once
+    s = (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)
+    if is_ccw:
+        return bool((s >= -EPS).all())
+    return bool((s <= EPS).all())
 
 def is_point_in_triangle(p, a, b, c):
     """Return True if point p is inside triangle a-b-c (including edges).
@@ -66,58 +177,147 @@ def is_point_in_triangle(p, a, b, c):
     Uses signed area tests to check that p is on the same side of all
     triangle edges.
     """
-    # Signed areas (cross products) relative to p — reuse cross_product for clarity
-    area1 = cross_product(p, a, b)
-    area2 = cross_product(p, b, c)
-    area3 = cross_product(p, c, a)
-
-    # Check that all signed areas have the same sign (or are within EPS of zero)
-    pos_ok = (area1 >= -EPS and area2 >= -EPS and area3 >= -EPS)
-    neg_ok = (area1 <= EPS and area2 <= EPS and area3 <= EPS)
-    return pos_ok or neg_ok
-
-def find_first_concavity(polygon):
+    # Signed areas (cross products) relative to p, i.e. cross_product(p, a, b)
+    # and so on, inlined over shared vertex-minus-p offsets: this is the
+    # innermost test of ear clipping and of the concavity-triangle method
+    px, py = p
+    dax, day = a[0] - px, a[1] - py
+    dbx, dby = b[0] - px, b[1] - py
+    dcx, dcy = c[0] - px, c[1] - py
+    area1 = dax * dby - day * dbx
+    area2 = dbx * dcy - dby * dcx
+    area3 = dcx * day - dcy * dax
+
+    # p is inside when the areas never disagree in sign (values within EPS
+    # of zero count as either sign); | avoids short-circuit branches
+    has_neg = (area1 < -EPS) | (area2 < -EPS) | (area3 < -EPS)
+    has_pos = (area1 > EPS) | (area2 > EPS) | (area3 > EPS)
+    return not (has_neg and has_pos)
+
+
+def _in_triangle_mask(area1, area2, area3):
+    """Elementwise is_point_in_triangle from the three signed-area arrays."""
+    has_neg = (area1 < -EPS) | (area2 < -EPS) | (area3 < -EPS)
+    has_pos = (area1 > EPS) | (area2 > EPS) | (area3 > EPS)
+    return ~(has_neg & has_pos)
+
+def find_first_concavity(polygon, is_ccw=None):
     """Find the index of the first concave vertex in the polygon.
 
     Returns the index of the first concave vertex, or -1 if the polygon is
-    convex. The function determines polygon orientation via signed area and
-    detects concave vertices accordingly.
+    convex. The function determines polygon orientation via signed area
+    (unless is_ccw is given) and detects concave vertices accordingly.
     """
     n = len(polygon)
     if n < 3:
         return -1
 
-    # Compute polygon signed area to determine orientation
-    area = 0.0
-    for i in range(n):
-        x1, y1 = polygon[i]
-        x2, y2 = polygon[(i + 1) % n]
-        area += (x1 * y2 - y1 * x2)
-
     # area > 0 -> counter-clockwise (CCW), area < 0 -> clockwise (CW)
-    if abs(area) <= EPS:
-        is_ccw = True
+    if is_ccw is None:
+        is_ccw = _orientation_is_ccw(polygon)
+
+    # Compute cross = (curr - prev) x (next - curr) at every vertex.
+    # For CCW polygon, a concave (right) turn has cross < 0
+    # For CW polygon, a concave turn has cross > 0
+    # (one loop per orientation so the scan does not re-test is_ccw).
+    # ring[i], ring[i + 1], ring[i + 2] is (prev, curr, next) of vertex i.
+    ring = [polygon[-1]]
+    ring.extend(polygon)
+    ring.append(polygon[0])
+    if is_ccw:
+        for i in range(n):
+            if cross_product(ring[i], ring[i + 1], ring[i + 2]) < -EPS:
+                return i
     else:
-        is_ccw = area > 0
+        for i in range(n):
+            if cross_product(ring[i], ring[i + 1], ring[i + 2]) > EPS:
+                return i
 
-    for i in range(n):
-        prev = polygon[(i - 1) % n]
-        curr = polygon[i]
-        next_pt = polygon[(i + 1) % n]
+    return -1  # no concave vertex found
 
-        # Compute cross = (curr - prev) x (next - curr) using helper
-        cross = cross_product(prev, curr, next_pt)
+class _ConcavityRemoval:
+    """Concave-vertex elimination of the concavity-triangle method.
 
-        # For CCW polygon, a concave (right) turn has cross < 0
-        # For CW polygon, a concave turn has cross > 0
-        if is_ccw:
-            if cross < -EPS:
-                return i
-        else:
-            if cross > EPS:
-                return i
+    The vertices sit in a circular doubly-linked list (prev_idx/next_idx)
+    and the concave ones in a min-heap of input indices. Removals keep the
+    input order, so the heap top is always the first concave vertex of the
+    current polygon, and removing a vertex only re-classifies its two
+    neighbours instead of re-scanning the whole polygon. The orientation is
+    tracked by subtracting each cut-off triangle from the shoelace sum.
+    """
 
-    return -1  # no concave vertex found
+    def __init__(self, polygon, area=None):
+        self.vertices = list(polygon)
+        n = self.count = len(self.vertices)
+        self.prev_idx = [i - 1 if i else n - 1 for i in range(n)]
+        self.next_idx = [i + 1 if i + 1 < n else 0 for i in range(n)]
+        self.head = 0
+        # callers that already have signed_area(polygon) can pass it in
+        self.area = signed_area(self.vertices) if area is None else area
+        self.is_ccw = _area_is_ccw(self.area)
+        self.concave = [n >= 3 and self._is_concave(i) for i in range(n)]
+        # already in index order, so a valid heap
+        self.heap = [i for i in range(n) if self.concave[i]]
+
+    def _is_concave(self, i):
+        v = self.vertices
+        cross = cross_product(v[self.prev_idx[i]], v[i], v[self.next_idx[i]])
+        return cross < -EPS if self.is_ccw else cross > EPS
+
+    def pop(self):
+        """Remove the first concave vertex and return its triangle.
+
+        Returns [prev, concave, next], or None once the polygon is convex or
+        fewer than 3 vertices remain.
+        """
+        if self.count < 3:
+            return None
+        # entries of vertices removed or no longer concave are stale
+        while self.heap and not self.concave[self.heap[0]]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return None
+
+        i = heapq.heappop(self.heap)
+        p, q = self.prev_idx[i], self.next_idx[i]
+        v = self.vertices
+        triangle = [v[p], v[i], v[q]]
+        self.concave[i] = False
+        self.next_idx[p] = q
+        self.prev_idx[q] = p
+        self.count -= 1
+        if i == self.head:
+            self.head = q
+
+        # Removing a vertex changes the shoelace sum by exactly the signed
+        # area of the triangle it cuts off
+        self.area -= cross_product(*triangle)
+        if _area_is_ccw(self.area) != self.is_ccw:
+            # only near-degenerate polygons flip: re-classify everything
+            self.is_ccw = not self.is_ccw
+            remaining = self.remaining_indices()
+            for k in remaining:
+                self.concave[k] = self._is_concave(k)
+            self.heap = sorted(k for k in remaining if self.concave[k])
+        elif self.count >= 3:
+            for k in (p, q):
+                was = self.concave[k]
+                self.concave[k] = self._is_concave(k)
+                if self.concave[k] and not was:
+                    heapq.heappush(self.heap, k)
+        return triangle
+
+    def remaining_indices(self):
+        out = []
+        k = self.head
+        for _ in range(self.count):
+            out.append(k)
+            k = self.next_idx[k]
+        return out
+
+    def remaining(self):
+        """Vertices still in the polygon, in input order."""
+        return [self.vertices[k] for k in self.remaining_indices()]
 
 def is_point_in_concave_polygon(point, polygon):
     """Concavity-triangle method for testing points in concave polygons.
@@ -127,57 +327,31 @@ def is_point_in_concave_polygon(point, polygon):
     the concave vertex is removed and the process repeats until the polygon
     becomes convex, at which point the convex test is used.
     """
-    current_poly = polygon.copy()
-
-    while len(current_poly) >= 3:
-        # Find first concave vertex
-        concavity_idx = find_first_concavity(current_poly)
-
-        if concavity_idx == -1:
-            # Polygon became convex - use the half-plane test
-            return in_convex_polygon(point, current_poly)
-
-        # Build the concavity triangle
-        n = len(current_poly)
-        prev_idx = (concavity_idx - 1) % n
-        next_idx = (concavity_idx + 1) % n
-
-        triangle = [
-            current_poly[prev_idx],
-            current_poly[concavity_idx],
-            current_poly[next_idx]
-        ]
-
+    if len(polygon) < 3:
+        return False
+    if len(polygon) == 3:
+        # a triangle has no concave vertex
+        return is_point_in_triangle(point, polygon[0], polygon[1], polygon[2])
+    # convex input (the common case) needs no concavity bookkeeping
+    area = signed_area(polygon)
+    is_ccw = _area_is_ccw(area)
+    if find_first_concavity(polygon, is_ccw) == -1:
+        return in_convex_polygon(point, polygon, is_ccw)
+
+    removal = _ConcavityRemoval(polygon, area)
+    while True:
+        # Find and remove the first concave vertex
+        triangle = removal.pop()
+        if triangle is None:
+            break
         # If the point is in the concavity triangle, it is outside
         if is_point_in_triangle(point, triangle[0], triangle[1], triangle[2]):
             return False
 
-        # Remove the concave vertex and continue
-        new_poly = []
-        for i in range(len(current_poly)):
-            if i != concavity_idx:
-                new_poly.append(current_poly[i])
-
-        current_poly = new_poly
-
-    return False
-
-if __name__ == "__main__":
-    # Example concave polygon (vertices provided in either CW or CCW order)
-    concave_polygon = [(0, 0), (5, 0), (5, 5), (3, 2), (0, 5)]
-
-    # Test points
-    test_points = [
-        (2, 2),  # inside
-        (4, 1),  # inside
-        (3, 3),  # outside (in the concavity)
-        (6, 3),  # outside
-        (1, 1)   # inside
-    ]
-
-    for point in test_points:
-        result = is_point_in_concave_polygon(point, concave_polygon)
-        print(f"Point {point} is {'inside' if result else 'outside'} the polygon")
+    if removal.count < 3:
+        return False
+    # Polygon became convex - use the half-plane test
+    return in_convex_polygon(point, removal.remaining(), removal.is_ccw)
 
 
 def is_point_in_polygon_ray(point, polygon, eps=1e-9):
@@ -190,10 +364,13 @@ def is_point_in_polygon_ray(point, polygon, eps=1e-9):
     if n < 3:
         return False
 
-    inside = False
+    ring = list(polygon)
+    ring.append(polygon[0])
+    # crossing count parity, toggled with XOR
+    parity = 0
     for i in range(n):
-        x1, y1 = polygon[i]
-        x2, y2 = polygon[(i + 1) % n]
+        x1, y1 = ring[i]
+        x2, y2 = ring[i + 1]
 
         # Check if point is exactly on the segment (inclusive boundary)
         if min(x1, x2) - eps <= x <= max(x1, x2) + eps and min(y1, y2) - eps <= y <= max(y1, y2) + eps:
@@ -201,17 +378,184 @@ def is_point_in_polygon_ray(point, polygon, eps=1e-9):
             if abs((x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)) <= eps:
                 return True
 
-        # Check if the horizontal ray intersects the edge
-        intersects = ((y1 > y) != (y2 > y))
-        if intersects:
+        # Check if the horizontal ray intersects the edge (the division is
+        # only safe once the edge is known to straddle y, so this stays a
+        # branch)
+        if (y1 > y) ^ (y2 > y):
             # compute x coordinate of intersection of edge with horizontal line at y
             xinters = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
-            if xinters > x:
-                inside = not inside
+            parity ^= xinters > x
 
+    return bool(parity)
+
+
+def points_in_polygon_ray(points, polygon, eps=1e-9, max_elems=1 << 20):
+    """Even-odd test of many points against one polygon.
+
+    Batch counterpart of is_point_in_polygon_ray: points is an (m, 2)
+    array-like and the result is an (m,) boolean array (boundary counts as
+    inside). Every (point, edge) pair is evaluated in one broadcast; the
+    points are processed in chunks so that at most max_elems pairs are
+    alive at a time. Points outside the polygon's bounding box are rejected
+    before the broadcast.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    inside = np.zeros(len(pts), dtype=bool)
+    if len(polygon) < 3:
+        return inside
+
+    poly = _as_poly_array(polygon)
+    # only points inside the bounding box reach the broadcast
+    (xmin, ymin), (xmax, ymax) = poly.min(axis=0), poly.max(axis=0)
+    candidates = np.nonzero(
+        (pts[:, 0] >= xmin - eps) & (pts[:, 0] <= xmax + eps)
+        & (pts[:, 1] >= ymin - eps) & (pts[:, 1] <= ymax + eps)
+    )[0]
+    pts = pts[candidates]
+
+    x1 = poly[:, 0][None, :]
+    y1 = poly[:, 1][None, :]
+    x2 = np.roll(x1, -1, axis=1)
+    y2 = np.roll(y1, -1, axis=1)
+    lo_x, hi_x = np.minimum(x1, x2) - eps, np.maximum(x1, x2) + eps
+    lo_y, hi_y = np.minimum(y1, y2) - eps, np.maximum(y1, y2) + eps
+    # horizontal edges never straddle, so their inf/nan slope (and the
+    # nan intersections it produces) is masked out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (x2 - x1) / (y2 - y1)
+
+    chunk = max(1, max_elems // len(poly))
+    for a in range(0, len(pts), chunk):
+        x = pts[a:a + chunk, 0:1]
+        y = pts[a:a + chunk, 1:2]
+        with np.errstate(invalid="ignore"):
+            crossings = ((y1 > y) != (y2 > y)) & (x < x1 + (y - y1) * slope)
+        on_edge = (
+            (lo_x <= x) & (x <= hi_x) & (lo_y <= y) & (y <= hi_y)
+            & (np.abs((x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)) <= eps)
+        )
+        inside[candidates[a:a + chunk]] = np.bitwise_xor.reduce(crossings, axis=1) | on_edge.any(axis=1)
     return inside
 
 
+# Reflex-set size from which trace_by_ear_clipping tests the candidates of
+# an ear in one NumPy expression instead of a Python loop.
+EAR_VECTORIZE_MIN = 24
+
+# Number of candidate edges from which the self-intersection sweep tests
+# them against the current edge in one NumPy pass.
+SEGMENT_VECTORIZE_MIN = 64
+
+
+def _on_segment(a, b, p):
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+def segments_intersect(a1, a2, b1, b2):
+    """Return True if segments a1-a2 and b1-b2 cross or touch."""
+    o1 = cross_product(a1, a2, b1)
+    o2 = cross_product(a1, a2, b2)
+    o3 = cross_product(b1, b2, a1)
+    o4 = cross_product(b1, b2, a2)
+
+    # Check special cases: collinear and on-segment
+    if abs(o1) <= EPS and _on_segment(a1, a2, b1):
+        return True
+    if abs(o2) <= EPS and _on_segment(a1, a2, b2):
+        return True
+    if abs(o3) <= EPS and _on_segment(b1, b2, a1):
+        return True
+    if abs(o4) <= EPS and _on_segment(b1, b2, a2):
+        return True
+
+    if (o1 > 0 and o2 < 0 or o1 < 0 and o2 > 0) and (o3 > 0 and o4 < 0 or o3 < 0 and o4 > 0):
+        return True
+
+    return False
+
+def _segments_intersect_many(a1, a2, b1, b2):
+    """Vectorized segments_intersect of a1-a2 against every b1[k]-b2[k].
+
+    b1 and b2 are (k, 2) arrays; returns a (k,) boolean mask. The segment
+    a1-a2 is fixed, so its direction is computed once for all k.
+    """
+    ax, ay = a1
+    adx, ady = a2[0] - ax, a2[1] - ay
+    b1x, b1y, b2x, b2y = b1[:, 0], b1[:, 1], b2[:, 0], b2[:, 1]
+    bdx, bdy = b2x - b1x, b2y - b1y
+    o1 = adx * (b1y - ay) - ady * (b1x - ax)
+    o2 = adx * (b2y - ay) - ady * (b2x - ax)
+    o3 = bdx * (ay - b1y) - bdy * (ax - b1x)
+    o4 = bdx * (a2[1] - b1y) - bdy * (a2[0] - b1x)
+
+    a_lo_x, a_hi_x = min(ax, a2[0]), max(ax, a2[0])
+    a_lo_y, a_hi_y = min(ay, a2[1]), max(ay, a2[1])
+    b_lo_x, b_hi_x = np.minimum(b1x, b2x), np.maximum(b1x, b2x)
+    b_lo_y, b_hi_y = np.minimum(b1y, b2y), np.maximum(b1y, b2y)
+    touch = (
+        (np.abs(o1) <= EPS) & (a_lo_x <= b1x) & (b1x <= a_hi_x) & (a_lo_y <= b1y) & (b1y <= a_hi_y)
+        | (np.abs(o2) <= EPS) & (a_lo_x <= b2x) & (b2x <= a_hi_x) & (a_lo_y <= b2y) & (b2y <= a_hi_y)
+        | (np.abs(o3) <= EPS) & (b_lo_x <= ax) & (ax <= b_hi_x) & (b_lo_y <= ay) & (ay <= b_hi_y)
+        | (np.abs(o4) <= EPS) & (b_lo_x <= a2[0]) & (a2[0] <= b_hi_x) & (b_lo_y <= a2[1]) & (a2[1] <= b_hi_y)
+    )
+    proper = (((o1 > 0) & (o2 < 0)) | ((o1 < 0) & (o2 > 0))) & (((o3 > 0) & (o4 < 0)) | ((o3 < 0) & (o4 > 0)))
+    return touch | proper
+
+def _edge_intersections(poly):
+    """Yield (i, j) for every pair of non-adjacent edges that intersect.
+
+    Edge i runs from poly[i] to poly[i + 1]. Sort-and-sweep over the edge
+    bounding boxes: edges are visited by increasing min x, an active list
+    keeps those whose x-range still reaches the sweep position, and only
+    active pairs whose y-ranges also overlap reach segments_intersect.
+    Two segments that intersect (or touch) always have overlapping boxes.
+    When many candidates share the current edge they are tested in one
+    NumPy pass (_segments_intersect_many) instead.
+    """
+    n = len(poly)
+    if n < 4:
+        return
+    ring = list(poly)
+    ring.append(poly[0])
+    boxes = []
+    for i in range(n):
+        (x1, y1), (x2, y2) = ring[i], ring[i + 1]
+        boxes.append((min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2)))
+
+    coords = None
+    active = []
+    for e in sorted(range(n), key=lambda k: boxes[k][0]):
+        x_lo, _, y_lo, y_hi = boxes[e]
+        active = [a for a in active if boxes[a][1] >= x_lo]
+        # active edges whose y-range also overlaps edge e
+        candidates = [a for a in active if boxes[a][2] <= y_hi and y_lo <= boxes[a][3]]
+        e1, e2 = ring[e], ring[e + 1]
+        if len(candidates) >= SEGMENT_VECTORIZE_MIN:
+            if coords is None:
+                coords = np.array(ring, dtype=np.float64)
+            idx = np.array(candidates)
+            hits = _segments_intersect_many(e1, e2, coords[idx], coords[idx + 1])
+            hits &= (np.abs(idx - e) != 1) & (np.abs(idx - e) != n - 1)
+            for a in idx[hits].tolist():
+                yield (a, e) if a < e else (e, a)
+        else:
+            for a in candidates:
+                i, j = (a, e) if a < e else (e, a)
+                # skip adjacent edges
+                if j == i + 1 or (i == 0 and j == n - 1):
+                    continue
+                if segments_intersect(e1, e2, ring[a], ring[a + 1]):
+                    yield i, j
+        active.append(e)
+
+def polygon_self_intersections(poly):
+    """Return the sorted (i, j) index pairs of intersecting non-adjacent edges."""
+    return sorted(_edge_intersections(poly))
+
+def polygon_has_self_intersections(poly):
+    """Return True if any two non-adjacent edges of poly intersect."""
+    return next(_edge_intersections(poly), None) is not None
+
+
 def trace_concavity_removal(polygon):
     """Return a list of states showing the concavity-removal process.
 
@@ -225,75 +569,23 @@ def trace_concavity_removal(polygon):
     """
     current_poly = list(polygon)
     trace = []
-    def _orient(a, b, c):
-        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
-
-    def _on_segment(a, b, p):
-        return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
-
-    def segments_intersect(a1, a2, b1, b2):
-        o1 = _orient(a1, a2, b1)
-        o2 = _orient(a1, a2, b2)
-        o3 = _orient(b1, b2, a1)
-        o4 = _orient(b1, b2, a2)
-
-        # Check special cases: collinear and on-segment
-        if abs(o1) <= EPS and _on_segment(a1, a2, b1):
-            return True
-        if abs(o2) <= EPS and _on_segment(a1, a2, b2):
-            return True
-        if abs(o3) <= EPS and _on_segment(b1, b2, a1):
-            return True
-        if abs(o4) <= EPS and _on_segment(b1, b2, a2):
-            return True
-
-        if (o1 > 0 and o2 < 0 or o1 < 0 and o2 > 0) and (o3 > 0 and o4 < 0 or o3 < 0 and o4 > 0):
-            return True
-
-        return False
-
-    def polygon_self_intersections(poly):
-        n = len(poly)
-        if n < 4:
-            return []
-        intersections = []
-        for i in range(n):
-            a1 = poly[i]
-            a2 = poly[(i + 1) % n]
-            for j in range(i + 1, n):
-                # skip adjacent edges
-                if j == i:
-                    continue
-                if j == (i + 1) % n or i == (j + 1) % n:
-                    continue
-                b1 = poly[j]
-                b2 = poly[(j + 1) % n]
-                if segments_intersect(a1, a2, b1, b2):
-                    intersections.append((i, j))
-        return intersections
 
     def is_vertex_concave(idx, poly, is_ccw):
-        n = len(poly)
-        prev = poly[(idx - 1) % n]
-        curr = poly[idx]
-        nxt = poly[(idx + 1) % n]
-        cross = cross_product(prev, curr, nxt)
+        # poly[idx - 1] wraps to the last vertex for idx == 0
+        nxt = idx + 1 if idx + 1 < len(poly) else 0
+        cross = cross_product(poly[idx - 1], poly[idx], poly[nxt])
         if is_ccw:
             return cross < -EPS
         else:
             return cross > EPS
 
+    # orientation, updated by the cut-off triangle on every removal
+    area = signed_area(current_poly)
+
     # restart loop with safer removal strategy
     while len(current_poly) >= 3:
         state = {"polygon": list(current_poly)}
-
-        # compute orientation
-        area = 0.0
-        for i in range(len(current_poly)):
-            x1, y1 = current_poly[i]
-            x2, y2 = current_poly[(i + 1) % len(current_poly)]
-            area += (x1 * y2 - y1 * x2)
-        is_ccw = True if abs(area) <= EPS else (area > 0)
+        is_ccw = _area_is_ccw(area)
 
         # collect concave vertex indices
         concave_indices = [i for i in range(len(current_poly)) if is_vertex_concave(i, current_poly, is_ccw)]
@@ -312,15 +604,16 @@ def trace_concavity_removal(polygon):
             triangle = [current_poly[prev_idx], current_poly[concavity_idx], current_poly[next_idx]]
             state_try = {"polygon": list(current_poly), "concavity_idx": concavity_idx, "triangle": triangle}
 
-            # form new polygon with this vertex removed
-            new_poly = [current_poly[i] for i in range(len(current_poly)) if i != concavity_idx]
-            # if removal causes no self-intersection, accept it
-            if not polygon_self_intersections(new_poly):
+            # remove the vertex in place; if that causes no self-intersection,
+            # accept it, otherwise put it back
+            vertex = current_poly.pop(concavity_idx)
+            if not polygon_has_self_intersections(current_poly):
                 trace.append(state_try)
-                current_poly = new_poly
+                area -= cross_product(*triangle)
                 removed = True
                 break
             else:
+                current_poly.insert(concavity_idx, vertex)
                 # record that this attempted removal would self-intersect (skipped)
                 state_try["skipped"] = True
                 trace.append(state_try)
@@ -340,53 +633,6 @@ def trace_by_ear_clipping(polygon):
     is not simple, the function will attempt to proceed but may return an incomplete trace.
     This is intended as an offline analysis helper to validate and visualize safe removals.
     """
-    from math import fabs
-
-    def _orient(a, b, c):
-        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
-
-    def _on_segment(a, b, p):
-        return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
-
-    def segments_intersect(a1, a2, b1, b2):
-        o1 = _orient(a1, a2, b1)
-        o2 = _orient(a1, a2, b2)
-        o3 = _orient(b1, b2, a1)
-        o4 = _orient(b1, b2, a2)
-
-        if abs(o1) <= EPS and _on_segment(a1, a2, b1):
-            return True
-        if abs(o2) <= EPS and _on_segment(a1, a2, b2):
-            return True
-        if abs(o3) <= EPS and _on_segment(b1, b2, a1):
-            return True
-        if abs(o4) <= EPS and _on_segment(b1, b2, a2):
-            return True
-
-        if (o1 > 0 and o2 < 0 or o1 < 0 and o2 > 0) and (o3 > 0 and o4 < 0 or o3 < 0 and o4 > 0):
-            return True
-
-        return False
-
-    def polygon_has_self_intersections(poly):
-        n = len(poly)
-        if n < 4:
-            return False
-        for i in range(n):
-            a1 = poly[i]
-            a2 = poly[(i + 1) % n]
-            for j in range(i + 1, n):
-                # skip adjacent edges
-                if j == i:
-                    continue
-                if j == (i + 1) % n or i == (j + 1) % n:
-                    continue
-                b1 = poly[j]
-                b2 = poly[(j + 1) % n]
-                if segments_intersect(a1, a2, b1, b2):
-                    return True
-        return False
-
     poly = list(polygon)
     trace = []
     # defensive: collapse exact duplicate consecutive vertices
@@ -406,59 +652,368 @@ def trace_by_ear_clipping(polygon):
     if len(poly) < 3:
         return trace
 
-    # main loop
-    max_iters = len(poly) * 2 + 10
-    iters = 0
-    while len(poly) > 3 and iters < max_iters:
-        iters += 1
-        n = len(poly)
-        # compute orientation
-        area = 0.0
-        for i in range(n):
-            x1, y1 = poly[i]
-            x2, y2 = poly[(i + 1) % n]
-            area += (x1 * y2 - y1 * x2)
-        is_ccw = True if abs(area) <= EPS else (area > 0)
-
-        ear_found = False
-        for i in range(n):
-            prev = poly[(i - 1) % n]
-            curr = poly[i]
-            nxt = poly[(i + 1) % n]
-            # convexity test
-            cross = _orient(prev, curr, nxt)
-            if is_ccw:
-                if cross <= EPS:
-                    continue
-            else:
-                if cross >= -EPS:
-                    continue
-
-            # check no other vertex inside triangle prev-curr-next
-            contains_other = False
-            for j in range(n):
-                if j in ((i - 1) % n, i, (i + 1) % n):
-                    continue
-                p = poly[j]
-                if is_point_in_triangle(p, prev, curr, nxt):
-                    contains_other = True
-                    break
-            if contains_other:
-                continue
-
-            # this is an ear: record and remove curr
-            state = {"polygon": list(poly), "removed_idx": i, "triangle": [prev, curr, nxt]}
-            trace.append(state)
-            del poly[i]
-            ear_found = True
-            break
+    # Vertices live in a circular doubly-linked list (prev_idx/next_idx),
+    # so removing an ear is O(1). An ear removal keeps the orientation and
+    # can only change the convexity and ear status of its two neighbours,
+    # so only those are re-examined; and since a triangle that contains a
+    # vertex contains a reflex one, the ear test only walks the set of
+    # reflex (non-convex) vertices.
+    n = len(poly)
+    prev_idx = [(i - 1) % n for i in range(n)]
+    next_idx = [(i + 1) % n for i in range(n)]
+    sign = 1.0 if _orientation_is_ccw(poly) else -1.0
+
+    def _is_convex(i):
+        return sign * cross_product(poly[prev_idx[i]], poly[i], poly[next_idx[i]]) > EPS
+
+    xy = _as_poly_array(poly)
+
+    def _is_ear(i):
+        p, q = prev_idx[i], next_idx[i]
+        a, b, c = poly[p], poly[i], poly[q]
+        if len(reflex) < EAR_VECTORIZE_MIN:
+            for j in reflex:
+                if j != p and j != q and is_point_in_triangle(poly[j], a, b, c):
+                    return False
+            return True
 
-        if not ear_found:
+        # is_point_in_triangle for every reflex vertex at once
+        idx = np.fromiter(reflex, dtype=np.intp, count=len(reflex))
+        idx = idx[(idx != p) & (idx != q)]
+        px, py = xy[idx, 0], xy[idx, 1]
+        dax, day = a[0] - px, a[1] - py
+        dbx, dby = b[0] - px, b[1] - py
+        dcx, dcy = c[0] - px, c[1] - py
+        area1 = dax * dby - day * dbx
+        area2 = dbx * dcy - dby * dcx
+        area3 = dcx * day - dcy * dax
+        return not np.any(_in_triangle_mask(area1, area2, area3))
+
+    reflex = {i for i in range(n) if not _is_convex(i)}
+    ear = [i not in reflex and _is_ear(i) for i in range(n)]
+
+    # head is the first remaining vertex of the input, so each step lists
+    # the current polygon (and numbers removed_idx) in the original order
+    head = 0
+    remaining = n
+    while remaining > 3:
+        order = []
+        i = head
+        for _ in range(remaining):
+            order.append(i)
+            i = next_idx[i]
+        pos = next((k for k, i in enumerate(order) if ear[i]), -1)
+        if pos == -1:
             # could be numeric/degenerate; stop early
             break
 
+        # this is an ear: record and unlink it
+        i = order[pos]
+        p, q = prev_idx[i], next_idx[i]
+        trace.append({"polygon": [poly[k] for k in order], "removed_idx": pos, "triangle": [poly[p], poly[i], poly[q]]})
+        next_idx[p] = q
+        prev_idx[q] = p
+        remaining -= 1
+        if i == head:
+            head = q
+
+        grew = False
+        for k in (p, q):
+            if _is_convex(k):
+                reflex.discard(k)
+            elif k not in reflex:
+                reflex.add(k)
+                grew = True
+        if grew:
+            # only possible for non-simple input: a new reflex vertex may
+            # lie in any cached ear, so reclassify everything
+            k = head
+            for _ in range(remaining):
+                ear[k] = k not in reflex and _is_ear(k)
+                k = next_idx[k]
+        else:
+            for k in (p, q):
+                ear[k] = k not in reflex and _is_ear(k)
+
     # append final triangle state if available
-    if len(poly) == 3:
-        trace.append({"polygon": list(poly), "removed_idx": -1, "triangle": [poly[0], poly[1], poly[2]]})
+    if remaining == 3:
+        a = head
+        b = next_idx[a]
+        c = next_idx[b]
+        trace.append({"polygon": [poly[a], poly[b], poly[c]], "removed_idx": -1, "triangle": [poly[a], poly[b], poly[c]]})
+
+    return trace
+
 
-    return trace
\ No newline at end of file
+@dataclass
+class PreparedPolygon:
+    """Query-independent data for repeated PIP tests against one polygon.
+
+    The orientation, the concavity triangles removed by the
+    concavity-triangle method and the half-plane coefficients of the convex
+    polygon it ends with never depend on the query point, so they are
+    computed once by prepare_polygon() and reused by contains(). The same
+    holds for the ear-clipping triangulation used by in_triangulation().
+
+    Attributes:
+      - vertices: the polygon as given
+      - is_convex: True if the polygon has no concave vertex
+      - is_ccw: orientation of the polygon (near-zero area counts as CCW)
+      - edges: (N, 3) array; row (a, b, c) is oriented so that a point
+        (x, y) is inside the remaining convex polygon when
+        a*x + b*y + c >= 0 for every row
+      - concavity_triangles: (T, 3, 2) array of the concavity triangles;
+        a point inside any of them is outside the polygon
+      - triangles: (T, 3, 2) ear-clipping triangulation from
+        prepare_concave(), or None if the polygon could not be triangulated
+      - triangle_edges: (T, 3, 3) array; row k of triangle t gives the
+        cross product of the query point with edge k of triangles[t] as
+        a*x + b*y + c, or None when triangles is None
+      - bbox: (min_x, min_y, max_x, max_y) of the vertices, checked before
+        anything else so far-away points are rejected in O(1)
+      - compiled: point -> bool function generated by compile_contains(),
+        equivalent to contains() with every coefficient baked in
+    """
+    vertices: list
+    is_convex: bool
+    is_ccw: bool
+    edges: np.ndarray
+    concavity_triangles: np.ndarray = field(default_factory=lambda: np.empty((0, 3, 2)))
+    triangles: Optional[np.ndarray] = None
+    triangle_edges: Optional[np.ndarray] = None
+    bbox: Optional[tuple] = None
+    compiled: Optional[Callable] = field(default=None, repr=False, compare=False)
+
+    def _outside_bbox(self, point):
+        if self.bbox is None:
+            return False
+        x, y = point
+        min_x, min_y, max_x, max_y = self.bbox
+        return x < min_x - EPS or x > max_x + EPS or y < min_y - EPS or y > max_y + EPS
+
+    def contains(self, point):
+        """Return the same result as is_point_in_concave_polygon(point, vertices)."""
+        if self._outside_bbox(point):
+            return False
+        for a, b, c in self.concavity_triangles:
+            if is_point_in_triangle(point, a, b, c):
+                return False
+        if len(self.edges) < 3:
+            return False
+        x, y = point
+        return bool(np.all(self.edges @ (x, y, 1.0) >= -EPS))
+
+    def in_triangulation(self, point):
+        """Return the same result as is_point_in_polygon_ray(point, vertices).
+
+        point_in_triangulation() on the cached ear-clipping triangles and
+        their coefficients; falls back to ray casting when the polygon
+        could not be triangulated.
+        """
+        if self._outside_bbox(point):
+            return False
+        if self.triangle_edges is None:
+            return is_point_in_polygon_ray(point, self.vertices)
+        return point_in_triangulation(point, self.triangles, self.triangle_edges)
+
+
+def _half_plane_coefficients(polygon, is_ccw=None):
+    """Return (N, 3) edge coefficients with inside => a*x + b*y + c >= 0."""
+    poly = _as_poly_array(polygon)
+    x0, y0 = poly[:, 0], poly[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    # row . (x, y, 1) == side((x, y), p0, p1), negated for CW polygons
+    edges = np.column_stack((y0 - y1, x1 - x0, x0 * y1 - x1 * y0))
+    if not (_orientation_is_ccw(polygon) if is_ccw is None else is_ccw):
+        edges = -edges
+    return edges
+
+
+def compile_contains(prepared):
+    """Generate a PreparedPolygon.contains() specialized to one polygon.
+
+    The source is built with the half-plane and concavity-triangle
+    coefficients written in as literals and every test unrolled, so a
+    query does no indexing, no modulo and no orientation check; e.g. for
+    a CCW quad:
+
+        def _pip_n4_ccw(point):
+            x, y = point
+            return (a0*x + b0*y + c0 >= -EPS) and ... and (a3*x + ...)
+
+    Each concavity triangle becomes three linear cross products checked
+    the same way as is_point_in_triangle, before the half-plane terms.
+    """
+    n = len(prepared.vertices)
+    name = "_pip_n%d_%s" % (n, "ccw" if prepared.is_ccw else "cw")
+    lines = ["def %s(point):" % name, "    x, y = point"]
+    if prepared.bbox is not None:
+        min_x, min_y, max_x, max_y = (float(v) for v in prepared.bbox)
+        lines.append("    if x < %r or x > %r or y < %r or y > %r:" % (
+            min_x - EPS, max_x + EPS, min_y - EPS, max_y + EPS))
+        lines.append("        return False")
+    for t, (a, b, c) in enumerate(prepared.concavity_triangles):
+        # cross_product(p, u, v) == (u.y - v.y)*x + (v.x - u.x)*y + (u.x*v.y - u.y*v.x)
+        for k, (u, v) in enumerate(((a, b), (b, c), (c, a))):
+            lines.append("    t%d_%d = %r*x + %r*y + %r" % (
+                t, k, float(u[1] - v[1]), float(v[0] - u[0]), float(u[0] * v[1] - u[1] * v[0])))
+        terms = ["t%d_%d" % (t, k) for k in range(3)]
+        lines.append("    if not ((%s) and (%s)):" % (
+            " or ".join("%s < %r" % (s, -EPS) for s in terms),
+            " or ".join("%s > %r" % (s, EPS) for s in terms)))
+        lines.append("        return False")
+    if len(prepared.edges) < 3:
+        lines.append("    return False")
+    else:
+        lines.append("    return (%s)" % " and\n            ".join(
+            "%r*x + %r*y + %r >= %r" % (float(a), float(b), float(c), -EPS)
+            for a, b, c in prepared.edges))
+    namespace = {}
+    exec(compile("\n".join(lines) + "\n", "<%s>" % name, "exec"), namespace)
+    return namespace[name]
+
+
+def _triangle_coefficients(triangles):
+    """Return (T, 3, 3) coefficients of the cross products against each edge.
+
+    For triangle (a, b, c), the rows give cross_product(p, a, b),
+    cross_product(p, b, c) and cross_product(p, c, a) as linear functions
+    of p: (u.y - v.y)*x + (v.x - u.x)*y + (u.x*v.y - u.y*v.x) for edge u-v.
+    """
+    # built column by column: point_in_triangulation() calls this per
+    # query when it is not given cached coefficients
+    ux, uy = triangles[..., 0], triangles[..., 1]
+    vx, vy = ux[:, (1, 2, 0)], uy[:, (1, 2, 0)]
+    coeffs = np.empty(triangles.shape[:2] + (3,))
+    coeffs[..., 0] = uy - vy
+    coeffs[..., 1] = vx - ux
+    coeffs[..., 2] = ux * vy - uy * vx
+    return coeffs
+
+
+def prepare_concave(polygon):
+    """Triangulate a simple polygon once with ear clipping.
+
+    Returns a (T, 3, 2) float64 array of triangles covering the polygon, or
+    None when ear clipping does not finish (degenerate or self-intersecting
+    input), in which case callers should fall back to a ray-casting test.
+    """
+    # ear clipping can run to completion on a self-intersecting polygon,
+    # but its triangles then do not cover the even-odd interior
+    if polygon_has_self_intersections(polygon):
+        return None
+    trace = trace_by_ear_clipping(polygon)
+    if not trace or trace[-1]["removed_idx"] != -1:
+        return None
+    return np.asarray([step["triangle"] for step in trace], dtype=np.float64)
+
+
+def point_in_triangulation(point, triangles, triangle_edges=None):
+    """Return True if point lies in any of the triangles (boundary included).
+
+    All triangles are tested in one matrix product with
+    is_point_in_triangle's sign rule. triangle_edges, the
+    _triangle_coefficients() of triangles, can be passed in when the same
+    triangles are queried many times.
+    """
+    if triangle_edges is None:
+        triangle_edges = _triangle_coefficients(np.asarray(triangles, dtype=np.float64))
+    x, y = point
+    areas = triangle_edges @ (x, y, 1.0)
+    return bool(np.any(_in_triangle_mask(*areas.T)))
+
+
+def prepare_polygon(polygon):
+    """Run the point-independent part of is_point_in_concave_polygon once."""
+    vertices = list(polygon)
+    removal = _ConcavityRemoval(vertices)
+    is_ccw = removal.is_ccw
+    triangles = []
+    while True:
+        triangle = removal.pop()
+        if triangle is None:
+            break
+        triangles.append(triangle)
+
+    if removal.count >= 3:
+        edges = _half_plane_coefficients(removal.remaining(), removal.is_ccw)
+    else:
+        edges = np.empty((0, 3))
+
+    ear_triangles = prepare_concave(vertices)
+    prepared = PreparedPolygon(
+        vertices=vertices,
+        is_convex=not triangles,
+        is_ccw=is_ccw,
+        edges=edges,
+        concavity_triangles=np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 2),
+        triangles=ear_triangles,
+        triangle_edges=_triangle_coefficients(ear_triangles) if ear_triangles is not None else None,
+        bbox=(*map(min, zip(*vertices)), *map(max, zip(*vertices))) if vertices else None,
+    )
+    prepared.compiled = compile_contains(prepared)
+    return prepared
+
+
+def point_in_polygons_csr(point, xs, ys, offsets, eps=1e-9, bboxes=None):
+    """Even-odd test of one point against polygons stored in CSR layout.
+
+    Polygon i owns the vertices xs[offsets[i]:offsets[i + 1]] (and the same
+    slice of ys). Returns a (P,) boolean array with the results of
+    is_point_in_polygon_ray for every polygon (polygons with fewer than 3
+    vertices are never hit): the crossings of every edge are computed in
+    one pass and summed per polygon. bboxes, a (P, 4) array of (min_x, min_y, max_x, max_y),
+    restricts the pass to the edges of polygons whose box holds the point.
+    """
+    x, y = point
+    offsets = np.asarray(offsets)
+    n_polys = len(offsets) - 1
+    lens = np.diff(offsets)
+    starts = offsets[:-1]
+    poly_id = np.repeat(np.arange(n_polys), lens)
+    # index of the next vertex, wrapping at the end of each polygon
+    nxt = np.arange(1, offsets[-1] + 1)
+    nonempty = lens > 0
+    nxt[offsets[1:][nonempty] - 1] = starts[nonempty]
+
+    edges = np.arange(offsets[-1])
+    if bboxes is not None:
+        candidates = (
+            (bboxes[:, 0] - eps <= x) & (x <= bboxes[:, 2] + eps)
+            & (bboxes[:, 1] - eps <= y) & (y <= bboxes[:, 3] + eps)
+        )
+        edges = edges[candidates[poly_id]]
+
+    x1 = xs[edges].astype(np.float64)
+    y1 = ys[edges].astype(np.float64)
+    x2 = xs[nxt[edges]].astype(np.float64)
+    y2 = ys[nxt[edges]].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossings = ((y1 > y) != (y2 > y)) & (x < x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+    on_edge = (
+        (np.minimum(x1, x2) - eps <= x) & (x <= np.maximum(x1, x2) + eps)
+        & (np.minimum(y1, y2) - eps <= y) & (y <= np.maximum(y1, y2) + eps)
+        & (np.abs((x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)) <= eps)
+    )
+    ids = poly_id[edges]
+    parity = np.bincount(ids, weights=crossings, minlength=n_polys).astype(np.int64) & 1
+    touching = np.bincount(ids, weights=on_edge, minlength=n_polys) > 0
+    return ((parity == 1) | touching) & (lens >= 3)
+
+
+if __name__ == "__main__":
+    # Example concave polygon (vertices provided in either CW or CCW order)
+    concave_polygon = [(0, 0), (5, 0), (5, 5), (3, 2), (0, 5)]
+
+    # Test points
+    test_points = [
+        (2, 2),  # inside
+        (4, 1),  # inside
+        (3, 3),  # outside (in the concavity)
+        (6, 3),  # outside
+        (1, 1)   # inside
+    ]
+
+    for point in test_points:
+        result = is_point_in_concave_polygon(point, concave_polygon)
+        print(f"Point {point} is {'inside' if result else 'outside'} the polygon")
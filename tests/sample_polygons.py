@@ -0,0 +1,5 @@
+"""Polygons shared by the geometry tests; deliberately free of pygame."""
+
+# the app's default polygon (polygon_draw.DEFAULT_POLYGON_STR)
+DEFAULT_POLYGON = "334,262;210,352;302,406;640,403;602,273;464,294;420,363;490,356;427,380;362,372;304,351;324,325;335,325;393,312;406,276;388,270;372,282;337,297"
+DEFAULT = [(int(x),int(y)) for part in DEFAULT_POLYGON.split(';') for x,y in [part.split(',')]]
@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+import pip_batch
+from polygon_draw import DEFAULT_POLYGON_STR, parse_polygon_from_string
+from polygon_point_pip import is_point_in_polygon_ray
+
+DEFAULT = parse_polygon_from_string(DEFAULT_POLYGON_STR)
+
+POLYGONS = [
+    DEFAULT,
+    [(0,0),(50,0),(50,50),(30,20),(0,50)],
+    [(100,100),(300,300),(300,100),(100,300)],  # self-intersecting bow-tie
+]
+
+
+def test_backend_order():
+    assert list(pip_batch.BACKENDS)[-1] == "numpy"
+    assert pip_batch.BACKEND == next(iter(pip_batch.BACKENDS))
+
+
+@pytest.mark.parametrize("name", list(pip_batch.BACKENDS))
+@pytest.mark.parametrize("poly", POLYGONS)
+def test_backends_match_ray_test(name, poly):
+    rng = random.Random(0)
+    points = [(rng.randint(-5, 650), rng.randint(-5, 500)) for _ in range(2003)]
+    result = pip_batch.BACKENDS[name](points, poly)
+    assert list(result) == [is_point_in_polygon_ray(p, poly) for p in points]
+
+
+def test_points_in_polygon():
+    poly = POLYGONS[1]
+    assert list(pip_batch.points_in_polygon([(10, 10), (30, 40), (0, 0)], poly)) == [True, False, True]
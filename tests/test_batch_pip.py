@@ -0,0 +1,101 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from polygon_point_pip import (
+    is_point_in_polygon_ray,
+    point_in_polygons_csr,
+    points_in_polygon_ray,
+)
+from sample_polygons import DEFAULT
+
+POLYGONS = [
+    DEFAULT,
+    [(0,0),(500,0),(500,500),(300,200),(0,500)],
+    [(0,300),(400,300),(400,0),(0,0)],
+    [(100,100),(300,300),(300,100),(100,300)],  # self-intersecting bow-tie
+    [(5,5),(6,6)],  # degenerate
+]
+
+
+def test_point_in_polygons_csr_matches_ray_test():
+    polys = POLYGONS[:2] + [[]] + POLYGONS[2:]
+    xs = np.array([x for poly in polys for x, _ in poly], dtype=np.int32)
+    ys = np.array([y for poly in polys for _, y in poly], dtype=np.int32)
+    offsets = np.cumsum([0] + [len(poly) for poly in polys])
+    bboxes = np.array([
+        (min(xs[a:b]), min(ys[a:b]), max(xs[a:b]), max(ys[a:b])) if b > a else (np.inf, np.inf, -np.inf, -np.inf)
+        for a, b in zip(offsets[:-1], offsets[1:])
+    ])
+    rng = random.Random(1)
+    for _ in range(2000):
+        pt = (rng.randint(-5, 650), rng.randint(-5, 520))
+        expected = [bool(poly) and is_point_in_polygon_ray(pt, poly) for poly in polys]
+        assert list(point_in_polygons_csr(pt, xs, ys, offsets)) == expected
+        assert list(point_in_polygons_csr(pt, xs, ys, offsets, bboxes=bboxes)) == expected
+
+
+def test_point_in_polygons_csr_empty():
+    empty = np.empty(0, dtype=np.int32)
+    assert point_in_polygons_csr((1, 1), empty, empty, [0]).shape == (0,)
+    assert point_in_polygons_csr((1, 1), empty, empty, [0], bboxes=np.empty((0, 4))).shape == (0,)
+
+
+@pytest.mark.parametrize("poly", POLYGONS)
+def test_points_in_polygon_matches_ray_test(poly):
+    rng = random.Random(3)
+    points = [(rng.randint(-5, 650), rng.randint(-5, 520)) for _ in range(1500)]
+    points += [(rng.uniform(-5, 650), rng.uniform(-5, 520)) for _ in range(500)]
+    points += list(poly)
+    expected = [is_point_in_polygon_ray(pt, poly) for pt in points]
+    assert list(points_in_polygon_ray(points, poly)) == expected
+    # a tiny chunk size exercises the chunked path
+    assert list(points_in_polygon_ray(points, poly, max_elems=37)) == expected
+
+
+def test_as_poly_array_converts_once():
+    from polygon_point_pip import _as_poly_array
+    arr = _as_poly_array([(0, 0), (4, 0), (4, 3)])
+    assert arr.dtype == np.float64 and arr.shape == (3, 2) and arr.flags.c_contiguous
+    assert _as_poly_array(arr) is arr
+    assert _as_poly_array([]).shape == (0, 2)
+    for bad in (np.zeros((4, 3)), np.zeros(5), np.zeros((2, 2, 2))):
+        with pytest.raises(ValueError):
+            _as_poly_array(bad)
+
+
+@pytest.mark.parametrize("poly", [
+    [(0,0),(40,0),(0,40)],
+    [(0,40),(40,0),(0,0)],
+    [(0,0),(40,0),(40,30),(0,30)],
+    [(0,30),(40,30),(40,0),(0,0)],
+    [(0,0),(40,10),(30,40),(5,25)],
+    [(0,0),(1,0),(2,0)],  # collinear
+])
+def test_small_polygon_fast_paths(poly):
+    from polygon_point_pip import in_convex_polygon, is_point_in_concave_polygon, signed_area
+    points = [(x, y) for x in range(-2, 43, 3) for y in range(-2, 43, 3)] + list(poly) + [(5, 0), (100, 0)]
+    expected = list(points_in_polygon_ray(points, poly))
+    assert [is_point_in_polygon_ray(pt, poly) for pt in points] == expected
+    assert [is_point_in_polygon_ray(pt, poly, eps=1e-10) for pt in points] == expected
+    if signed_area(poly) == 0:
+        # the half-plane methods accept the whole line of a flat polygon
+        assert not expected[-1]
+        return
+    assert [in_convex_polygon(pt, poly) for pt in points] == expected
+    assert [is_point_in_concave_polygon(pt, poly) for pt in points] == expected
+
+
+@pytest.mark.parametrize("n", [5, 100])
+def test_convex_vectorized_matches_loop(monkeypatch, n):
+    import polygon_point_pip
+    poly = [(50 + 40 * math.cos(2 * math.pi * k / n), 50 + 40 * math.sin(2 * math.pi * k / n)) for k in range(n)]
+    points = [(x, y) for x in range(0, 101, 4) for y in range(0, 101, 4)] + poly
+    for p in (poly, poly[::-1]):
+        monkeypatch.setattr(polygon_point_pip, "CONVEX_VECTORIZE_MIN", 10**9)
+        loop = [polygon_point_pip.in_convex_polygon(pt, p) for pt in points]
+        monkeypatch.setattr(polygon_point_pip, "CONVEX_VECTORIZE_MIN", 0)
+        assert [polygon_point_pip.in_convex_polygon(pt, p) for pt in points] == loop
+        assert loop == list(points_in_polygon_ray(points, p))
@@ -0,0 +1,34 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import polygon_draw
+
+
+@pytest.fixture
+def fonts():
+    pygame.font.init()
+    polygon_draw._text_cache.clear()
+    yield
+    polygon_draw._text_cache.clear()
+
+
+def test_draw_text_renders_once(fonts, monkeypatch):
+    surface = pygame.Surface((200, 50))
+    polygon_draw.draw_text(surface, "hello", (0, 0))
+    cached = dict(polygon_draw._text_cache)
+    assert len(cached) == 1
+    # a repeated call must not touch the font at all
+    monkeypatch.setattr(pygame.font, "SysFont", None)
+    polygon_draw.draw_text(surface, "hello", (0, 20))
+    assert polygon_draw._text_cache == cached
+    polygon_draw.draw_text(surface, "hello", (0, 20), color=(255, 0, 0))
+    assert len(polygon_draw._text_cache) == 2
+
+
+def test_text_cache_is_bounded(fonts, monkeypatch):
+    monkeypatch.setattr(polygon_draw, "TEXT_CACHE_LIMIT", 3)
+    surface = pygame.Surface((200, 50))
+    for i in range(10):
+        polygon_draw.draw_text(surface, f"Polygons: {i}", (0, 0))
+    assert len(polygon_draw._text_cache) <= 3
@@ -1,8 +1,16 @@
+import math
+import random
+
 import pytest
-from polygon_point_pip import trace_by_ear_clipping, is_point_in_triangle
+from polygon_point_pip import (
+    is_point_in_triangle,
+    polygon_has_self_intersections,
+    polygon_self_intersections,
+    trace_by_ear_clipping,
+)
+from sample_polygons import DEFAULT
 
-# A helper polygon_self_intersections isn't exported; recreate a simple
-# intersection check here for tests.
+# Brute-force O(n^2) reference for the sweep in polygon_self_intersections.
 
 def segments_intersect(a1, a2, b1, b2):
     def orient(a,b,c):
@@ -64,3 +72,98 @@ def test_default_problematic_polygon():
     trace = trace_by_ear_clipping(poly)
     for step in trace:
         assert not poly_has_self_intersections(step['polygon'])
+
+
+def test_point_in_triangle_edges_and_orientation():
+    a, b, c = (0,0), (4,0), (0,4)
+    for tri in [(a, b, c), (c, b, a)]:
+        assert is_point_in_triangle((1,1), *tri)
+        assert is_point_in_triangle((2,0), *tri)   # on an edge
+        assert is_point_in_triangle((0,0), *tri)   # on a vertex
+        assert not is_point_in_triangle((3,3), *tri)
+        assert not is_point_in_triangle((-1,1), *tri)
+
+
+def test_self_intersection_sweep_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(300):
+        poly = [(rng.randint(0, 20), rng.randint(0, 20)) for _ in range(rng.randint(3, 12))]
+        n = len(poly)
+        expected = [
+            (i, j) for i in range(n) for j in range(i + 1, n)
+            if n >= 4 and j != i + 1 and not (i == 0 and j == n - 1)
+            and segments_intersect(poly[i], poly[(i + 1) % n], poly[j], poly[(j + 1) % n])
+        ]
+        assert polygon_self_intersections(poly) == expected
+        assert polygon_has_self_intersections(poly) == poly_has_self_intersections(poly)
+
+
+def test_self_intersection_vectorized_matches_brute_force():
+    # long edges on a small grid: many overlapping boxes, collinear touches
+    rng = random.Random(1)
+    poly = [(rng.randint(0, 30), rng.randint(0, 30)) for _ in range(150)]
+    n = len(poly)
+    expected = [
+        (i, j) for i in range(n) for j in range(i + 1, n)
+        if j != i + 1 and not (i == 0 and j == n - 1)
+        and segments_intersect(poly[i], poly[(i + 1) % n], poly[j], poly[(j + 1) % n])
+    ]
+    assert polygon_self_intersections(poly) == expected
+
+
+def spiral_polygon(turns=2.5, k=14):
+    """Thick Archimedean spiral: out along the outer arm, back along the inner."""
+    m = int(turns * k)
+    def arm(r0):
+        return [(round(300 + (r0 + 9 * t) * math.cos(2 * math.pi * t / k)),
+                 round(300 + (r0 + 9 * t) * math.sin(2 * math.pi * t / k))) for t in range(m)]
+    return arm(40) + arm(20)[::-1]
+
+
+# Triangles (as input vertex indices) of the original list-based ear clipper.
+EXPECTED_EAR_TRIANGLES = {
+    "default": [
+        (17,0,1),(3,4,5),(5,6,7),(3,5,7),(3,7,8),(2,3,8),(2,8,9),(1,2,9),(1,9,10),(17,1,10),
+        (17,10,11),(17,11,12),(17,12,13),(17,13,14),(14,15,16),(14,16,17),
+    ],
+    "spiral": [
+        (69,0,1),(1,2,3),(1,3,4),(4,5,6),(6,7,8),(8,9,10),(10,11,12),(12,13,14),(14,15,16),(16,17,18),
+        (33,34,35),(33,35,36),(32,33,36),(32,36,37),(31,32,37),(31,37,38),(30,31,38),(30,38,39),
+        (29,30,39),(29,39,40),(28,29,40),(28,40,41),(27,28,41),(27,41,42),(26,27,42),(26,42,43),
+        (25,26,43),(25,43,44),(24,25,44),(24,44,45),(23,24,45),(23,45,46),(22,23,46),(22,46,47),
+        (21,22,47),(21,47,48),(20,21,48),(20,48,49),(19,20,49),(19,49,50),(18,19,50),(18,50,51),
+        (18,51,52),(16,18,52),(16,52,53),(16,53,54),(14,16,54),(14,54,55),(14,55,56),(12,14,56),
+        (12,56,57),(12,57,58),(10,12,58),(10,58,59),(10,59,60),(8,10,60),(8,60,61),(6,8,61),
+        (6,61,62),(6,62,63),(4,6,63),(4,63,64),(4,64,65),(4,65,66),(1,4,66),(1,66,67),(1,67,68),
+        (1,68,69),
+    ],
+}
+
+
+@pytest.mark.parametrize("name", ["default", "spiral"])
+def test_ear_clipping_matches_reference_triangles(name):
+    poly = DEFAULT if name == "default" else spiral_polygon()
+    index = {v: i for i, v in enumerate(poly)}
+    assert len(index) == len(poly)
+    triangles = [tuple(index[v] for v in step["triangle"]) for step in trace_by_ear_clipping(poly)]
+    assert triangles == EXPECTED_EAR_TRIANGLES[name]
+
+
+def _star_polygon(n, seed):
+    # random radii around a centre: always simple, about half the vertices reflex
+    rng = random.Random(seed)
+    radii = [rng.uniform(60, 250) for _ in range(n)]
+    return [(round(300 + r * math.cos(2 * math.pi * k / n)), round(300 + r * math.sin(2 * math.pi * k / n)))
+            for k, r in enumerate(radii)]
+
+
+@pytest.mark.parametrize("poly", [spiral_polygon(), _star_polygon(120, 0), _star_polygon(200, 1)[::-1]])
+def test_vectorized_ear_test_matches_loop(monkeypatch, poly):
+    import polygon_point_pip
+    monkeypatch.setattr(polygon_point_pip, "EAR_VECTORIZE_MIN", 10**9)
+    loop = trace_by_ear_clipping(poly)
+    monkeypatch.setattr(polygon_point_pip, "EAR_VECTORIZE_MIN", 0)
+    vectorized = trace_by_ear_clipping(poly)
+    assert len(loop) == len(poly) - 2
+    assert [step["triangle"] for step in vectorized] == [step["triangle"] for step in loop]
+    assert [step["removed_idx"] for step in vectorized] == [step["removed_idx"] for step in loop]
@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("numba")
+np = pytest.importorskip("numpy")
+
+import pip_numba
+from polygon_point_pip import (
+    find_first_concavity,
+    in_convex_polygon,
+    is_point_in_concave_polygon,
+    is_point_in_polygon_ray,
+)
+from sample_polygons import DEFAULT
+
+POLYGONS = [
+    [(0,0),(4,0),(4,3),(0,3)],
+    [(0,3),(4,3),(4,0),(0,0)],
+    [(0,0),(5,0),(5,5),(3,2),(0,5)],
+    DEFAULT,
+]
+
+
+def _grid(poly, step):
+    xs = [p[0] for p in poly]
+    ys = [p[1] for p in poly]
+    for y in range(min(ys) - 1, max(ys) + 2, step):
+        for x in range(min(xs) - 1, max(xs) + 2, step):
+            yield (x, y)
+
+
+@pytest.mark.parametrize("poly", POLYGONS)
+def test_compiled_kernels_match_pure_python(poly):
+    arr = np.asarray(poly, dtype=np.float64)
+    step = max(1, (max(p[0] for p in poly) - min(p[0] for p in poly)) // 40)
+    assert pip_numba.find_first_concavity(arr) == find_first_concavity(poly)
+    for x, y in _grid(poly, step):
+        assert pip_numba.is_point_in_polygon_ray(float(x), float(y), arr) == is_point_in_polygon_ray((x, y), poly)
+        assert pip_numba.is_point_in_concave_polygon(float(x), float(y), arr) == is_point_in_concave_polygon((x, y), poly)
+        assert pip_numba.in_convex_polygon(float(x), float(y), arr) == in_convex_polygon((x, y), poly)
+        assert pip_numba.point_in_polygon_ray((x, y), poly) == is_point_in_polygon_ray((x, y), poly)
+
+
+@pytest.mark.parametrize("poly", POLYGONS + [[(100,100),(300,300),(300,100),(100,300)]])
+def test_integer_kernel_matches_pure_python(poly):
+    arr = np.asarray(poly, dtype=np.int32)
+    xs = sorted({x for x, _ in _grid(poly, 1)})
+    ys = sorted({y for _, y in _grid(poly, 1)})
+    step = max(1, len(xs) // 60)
+    xs, ys = np.array(xs[::step]), np.array(ys[::step])
+    mask = pip_numba.polygon_mask_ray_int(arr, xs, ys)
+    for r, y in enumerate(ys):
+        for c, x in enumerate(xs):
+            assert mask[r, c] == is_point_in_polygon_ray((int(x), int(y)), poly)
+
+
+@pytest.mark.parametrize("poly", POLYGONS)
+@pytest.mark.parametrize("m", [100, 5000])
+def test_batch_kernel_matches_pure_python(poly, m):
+    rng = np.random.default_rng(0)
+    lo = np.min(poly, axis=0) - 2
+    hi = np.max(poly, axis=0) + 2
+    points = rng.integers(lo, hi, size=(m, 2))
+    expected = [is_point_in_polygon_ray(tuple(p), poly) for p in points.tolist()]
+    assert list(pip_numba.points_in_polygon_ray(points, poly)) == expected
+    assert list(pip_numba.points_in_polygon_ray(points, poly, num_threads=1)) == expected
+
+
+def _exact_ray_int(x, y, poly):
+    # the integer kernel's test in unbounded Python ints
+    parity = False
+    for i in range(len(poly)):
+        (x1, y1), (x2, y2) = poly[i], poly[(i + 1) % len(poly)]
+        d = (x - x1) * (y2 - y1) - (y - y1) * (x2 - x1)
+        if d == 0 and min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2):
+            return True
+        parity ^= ((y1 > y) != (y2 > y)) and ((d < 0) == (y2 > y1))
+    return parity
+
+
+def test_integer_kernel_exact_at_coordinate_limit():
+    b = pip_numba.INT_COORD_LIMIT - 1
+    poly = [(-b, -b), (b, -b + 1), (b, b), (-b + 1, b), (0, 0)]
+    arr = np.asarray(poly, dtype=np.int32)
+    rng = np.random.default_rng(0)
+    points = rng.integers(-b, b, size=(2000, 2), endpoint=True).tolist()
+    points += [list(p) for p in poly] + [[b, 0], [-b, -b + 1], [b, b - 1]]
+    for x, y in points:
+        assert pip_numba.is_point_in_polygon_ray_int(x, y, arr) == _exact_ray_int(x, y, poly)
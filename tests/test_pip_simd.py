@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pip_simd = pytest.importorskip("pip_simd", exc_type=ImportError)
+
+from polygon_point_pip import is_point_in_polygon_ray
+from sample_polygons import DEFAULT
+
+
+@pytest.mark.parametrize("poly", [
+    DEFAULT,
+    [(0,0),(50,0),(50,50),(30,20),(0,50)],
+    [(100,100),(300,300),(300,100),(100,300)],
+])
+def test_batch_matches_ray_test(poly):
+    rng = random.Random(0)
+    # odd count so the scalar tail after the 4-wide blocks is exercised
+    points = [(rng.randint(-5, 650), rng.randint(-5, 500)) for _ in range(4003)]
+    result = pip_simd.point_in_polygon_batch(points, poly)
+    assert result.dtype == bool
+    assert list(result) == [is_point_in_polygon_ray(p, poly) for p in points]
+
+
+def test_batch_degenerate_polygon():
+    assert not pip_simd.point_in_polygon_batch([(0, 0), (1, 1)], [(0, 0), (1, 1)]).any()
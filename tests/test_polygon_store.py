@@ -0,0 +1,41 @@
+import io
+
+import pytest
+
+pytest.importorskip("pygame")
+np = pytest.importorskip("numpy")
+
+from polygon_draw import PolygonStore
+
+
+def test_append_and_index():
+    store = PolygonStore(capacity=4)  # force the arrays to grow
+    store.append_poly([(0,0),(4,0),(4,3)])
+    store.append_poly([(10,10),(20,10),(20,20),(10,20)])
+    assert len(store) == 2
+    assert store.offsets.tolist() == [0, 3, 7]
+    assert store.xs.dtype == np.int32
+    assert store.xs.tolist() == [0,4,4,10,20,20,10]
+    assert store[1] == [(10,10),(20,10),(20,20),(10,20)]
+    assert list(store) == [store[0], store[1]]
+    assert store.bboxes.tolist() == [[0,0,4,3],[10,10,20,20]]
+
+
+def test_contains_point_and_clear():
+    store = PolygonStore()
+    store.append_poly([(0,0),(4,0),(4,3)])
+    store.append_poly([(10,10),(20,10),(20,20),(10,20)])
+    assert store.contains_point((3, 1)).tolist() == [True, False]
+    assert store.contains_point((15, 15)).tolist() == [False, True]
+    store.clear()
+    assert len(store) == 0
+    assert store.contains_point((15, 15)).tolist() == []
+
+
+def test_write():
+    store = PolygonStore()
+    store.append_poly([(0,0),(4,0),(4,3)])
+    store.append_poly([(1,2),(3,4),(5,6)])
+    f = io.StringIO()
+    store.write(f)
+    assert f.getvalue() == "0,0;4,0;4,3\n1,2;3,4;5,6\n"
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from polygon_point_pip import (
+    is_point_in_concave_polygon,
+    is_point_in_polygon_ray,
+    point_in_triangulation,
+    prepare_concave,
+    prepare_polygon,
+)
+from sample_polygons import DEFAULT
+
+
+@pytest.mark.parametrize("poly", [
+    [(0,0),(4,0),(4,3),(0,3)],
+    [(0,3),(4,3),(4,0),(0,0)],
+    [(0,0),(5,0),(5,5),(3,2),(0,5)],
+    DEFAULT,
+    DEFAULT[::-1],
+])
+def test_prepared_contains_matches_concave_test(poly):
+    prepared = prepare_polygon(poly)
+    rng = random.Random(0)
+    xs = [p[0] for p in poly]
+    ys = [p[1] for p in poly]
+    for _ in range(2000):
+        pt = (rng.randint(min(xs) - 1, max(xs) + 1), rng.randint(min(ys) - 1, max(ys) + 1))
+        assert prepared.contains(pt) == is_point_in_concave_polygon(pt, poly)
+
+
+def test_prepared_convexity_and_orientation():
+    square = prepare_polygon([(0,0),(4,0),(4,3),(0,3)])
+    assert square.is_convex and square.is_ccw
+    assert len(square.concavity_triangles) == 0
+    concave = prepare_polygon([(0,5),(3,2),(5,5),(5,0),(0,0)])
+    assert not concave.is_convex and not concave.is_ccw
+
+
+@pytest.mark.parametrize("poly", [
+    [(0,0),(4,0),(4,3),(0,3)],
+    [(0,3),(4,3),(4,0),(0,0)],
+    [(0,0),(5,0),(5,5),(3,2),(0,5)],
+    [(0,0),(1,1)],
+    DEFAULT,
+    DEFAULT[::-1],
+])
+def test_compiled_contains_matches_prepared(poly):
+    prepared = prepare_polygon(poly)
+    assert prepared.compiled.__name__ == "_pip_n%d_%s" % (len(poly), "ccw" if prepared.is_ccw else "cw")
+    rng = random.Random(2)
+    xs = [p[0] for p in poly]
+    ys = [p[1] for p in poly]
+    for _ in range(2000):
+        pt = (rng.randint(min(xs) - 1, max(xs) + 1), rng.randint(min(ys) - 1, max(ys) + 1))
+        assert prepared.compiled(pt) == prepared.contains(pt)
+
+
+def test_bbox_rejects_far_points():
+    poly = [(0,0),(5,0),(5,5),(3,2),(0,5)]
+    prepared = prepare_polygon(poly)
+    assert prepared.bbox == (0, 0, 5, 5)
+    for pt in [(-1, 2), (6, 2), (2, -1), (2, 6), (100, 100)]:
+        assert not prepared.contains(pt)
+        assert not prepared.compiled(pt)
+        assert not is_point_in_concave_polygon(pt, poly)
+        assert not is_point_in_polygon_ray(pt, poly)
+    # boundary points on the box are still tested normally
+    assert prepared.contains((5, 0)) and prepared.compiled((0, 0))
+
+
+@pytest.mark.parametrize("poly", [
+    [(0,0),(4,0),(4,3),(0,3)],
+    [(0,0),(5,0),(5,5),(3,2),(0,5)],
+    [(100,100),(300,300),(300,100),(100,300)],  # bow-tie: no triangulation
+    DEFAULT,
+    DEFAULT[::-1],
+])
+def test_triangulation_matches_ray_test(poly):
+    prepared = prepare_polygon(poly)
+    triangles = prepare_concave(poly)
+    if triangles is not None:
+        assert triangles.shape == (len(poly) - 2, 3, 2)
+    rng = random.Random(4)
+    xs = [p[0] for p in poly]
+    ys = [p[1] for p in poly]
+    for _ in range(2000):
+        pt = (rng.uniform(min(xs) - 1, max(xs) + 1), rng.uniform(min(ys) - 1, max(ys) + 1))
+        expected = is_point_in_polygon_ray(pt, poly)
+        assert prepared.in_triangulation(pt) == expected
+        if triangles is not None:
+            assert point_in_triangulation(pt, triangles) == expected
+    # integer points land on the shared diagonals and on the boundary
+    for _ in range(2000):
+        pt = (rng.randint(min(xs) - 1, max(xs) + 1), rng.randint(min(ys) - 1, max(ys) + 1))
+        assert prepared.in_triangulation(pt) == is_point_in_polygon_ray(pt, poly)
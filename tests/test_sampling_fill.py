@@ -0,0 +1,121 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+np = pytest.importorskip("numpy")
+
+import pip_batch
+import polygon_draw
+from polygon_point_pip import is_point_in_polygon_ray
+from sample_polygons import DEFAULT
+
+CONVEX = [(10,10),(50,12),(45,40),(12,35)]
+CONCAVE = [(0,0),(50,0),(50,50),(30,20),(0,50)]
+# self-intersecting, with no concave turn: even-odd leaves the centre out
+PENTAGRAM = [(26,2),(40,45),(3,18),(49,18),(12,45)]
+
+
+@pytest.mark.parametrize("poly", [CONVEX, CONVEX[::-1], CONCAVE, CONCAVE[::-1], PENTAGRAM])
+@pytest.mark.parametrize("kernel", list(pip_batch.BACKENDS))
+def test_sampling_mask_matches_ray_test(monkeypatch, poly, kernel):
+    monkeypatch.setattr(pip_batch, "_backend", pip_batch.BACKENDS[kernel])
+    xs = np.arange(-2, 55, 1) + 0.5
+    ys = np.arange(-2, 55, 1) + 0.5
+    mask = polygon_draw.polygon_sampling_mask(poly, xs, ys)
+    assert mask.shape == (len(ys), len(xs))
+    for r, y in enumerate(ys):
+        for c, x in enumerate(xs):
+            assert mask[r, c] == is_point_in_polygon_ray((x, y), poly)
+
+
+def test_sampling_fill_writes_pixels(monkeypatch):
+    # force the sampling path instead of the ear-clipping triangles
+    monkeypatch.setattr(polygon_draw, "prepare_concave", lambda poly: None)
+    surface = pygame.Surface((64, 64))
+    polygon_draw.draw_filled_polygon_by_sampling(surface, CONCAVE, (255, 0, 0))
+    assert surface.get_at((10, 40))[:3] == (255, 0, 0)
+    assert surface.get_at((30, 40))[:3] == (0, 0, 0)
+    assert surface.get_at((60, 60))[:3] == (0, 0, 0)
+
+
+@pytest.mark.parametrize("step", [1, 3])
+def test_scanline_fill_matches_sampling_mask(monkeypatch, step):
+    monkeypatch.setattr(polygon_draw, "prepare_concave", lambda poly: None)
+    # fractional vertices so no pixel centre lies exactly on an edge
+    poly = [(2.3, 3.1), (60.7, 5.2), (30.4, 30.6), (58.2, 61.3), (4.9, 50.8), (40.1, 20.2)]
+    surface = pygame.Surface((64, 64))
+    polygon_draw.draw_filled_polygon_by_sampling(surface, poly, (0, 255, 0), sample_step=step)
+    xs = np.arange(2, 61, step)
+    ys = np.arange(3, 62, step)
+    mask = polygon_draw.polygon_sampling_mask(poly, xs, ys)
+    for r, y in enumerate(ys):
+        for c, x in enumerate(xs):
+            assert (surface.get_at((int(x), int(y)))[:3] == (0, 255, 0)) == mask[r, c]
+
+
+@pytest.mark.parametrize("step", [1, 3])
+@pytest.mark.parametrize("poly", [
+    [(10,10),(20,10),(20,20),(10,20)],
+    [(10,10),(50,50),(50,10),(10,50)],  # self-intersecting bow-tie
+    CONCAVE,
+])
+def test_scanline_fill_includes_integer_boundary(monkeypatch, poly, step):
+    # integer vertices: bottom edges and vertices lie on pixel rows
+    monkeypatch.setattr(polygon_draw, "prepare_concave", lambda poly: None)
+    surface = pygame.Surface((64, 64))
+    polygon_draw.draw_filled_polygon_by_sampling(surface, poly, (0, 255, 0), sample_step=step)
+    min_x = min(p[0] for p in poly)
+    min_y = min(p[1] for p in poly)
+    for y in range(min_y, 64, step):
+        for x in range(min_x, 64, step):
+            assert (surface.get_at((x, y))[:3] == (0, 255, 0)) == is_point_in_polygon_ray((x, y), poly)
+
+
+def test_render_sampled_fill_matches_mask():
+    surface, pos = polygon_draw.render_sampled_fill(CONCAVE, (255, 0, 0))
+    assert pos == (0, 0)
+    assert surface.get_size() == (51, 51)
+    mask = polygon_draw.polygon_sampling_mask(CONCAVE, np.arange(0, 51), np.arange(0, 51))
+    for y in range(0, 51, 5):
+        for x in range(0, 51, 5):
+            assert (surface.get_at((x, y)) == (255, 0, 0, 255)) == mask[y, x]
+
+
+def test_fill_renderer_returns_finished_fill():
+    renderer = polygon_draw.FillRenderer()
+    try:
+        first = renderer.get(0, CONVEX, (1, 2, 3), 1)
+        renderer._futures[(0, (1, 2, 3), 1)].result(timeout=10)
+        fill = renderer.get(0, CONVEX, (1, 2, 3), 1)
+        assert fill is not None
+        assert first is None or first is fill
+        assert fill[1] == (10, 10)
+    finally:
+        renderer.shutdown()
+
+
+@pytest.mark.parametrize("poly", [CONVEX, CONCAVE, [(100,100),(300,300),(300,100),(100,300)],
+                                  [(3.5,2.25),(250.75,40.5),(120.5,90.25),(240.25,230.5),(10.5,200.75)]])
+@pytest.mark.parametrize("step", [1, 3])
+def test_tiled_mask_matches_sampling_mask(poly, step):
+    xs = np.arange(0, 320, step)
+    ys = np.arange(0, 310, step)
+    expected = polygon_draw.polygon_sampling_mask(poly, xs, ys)
+    assert (polygon_draw.polygon_tiled_mask(poly, xs, ys) == expected).all()
+    assert (polygon_draw.polygon_tiled_mask(poly, xs, ys, tile=7) == expected).all()
+
+
+def test_sampling_mask_large_integer_coordinates():
+    # beyond the integer kernel's exact range: must take the float path
+    b = 2**31
+    poly = np.array([(b, b), (b + 12, b), (b + 12, b + 12), (b, b + 12)], dtype=np.int64)
+    xs = np.arange(b - 1, b + 13, dtype=np.int64)
+    ys = np.arange(b - 1, b + 13, dtype=np.int64)
+    mask = polygon_draw.polygon_sampling_mask(poly, xs, ys)
+    pts = poly.tolist()
+    for r, y in enumerate(ys.tolist()):
+        for c, x in enumerate(xs.tolist()):
+            assert mask[r, c] == is_point_in_polygon_ray((x, y), pts)
+
+
+def test_sample_polygon_matches_app_default():
+    assert polygon_draw.parse_polygon_from_string(polygon_draw.DEFAULT_POLYGON_STR) == DEFAULT
@@ -0,0 +1,40 @@
+import pytest
+
+from polygon_point_pip import find_first_concavity, in_convex_polygon, signed_area
+
+
+def test_signed_area_orientation():
+    square = [(0,0),(4,0),(4,3),(0,3)]
+    assert signed_area(square) == pytest.approx(24.0)
+    assert signed_area(square[::-1]) == pytest.approx(-24.0)
+
+
+def test_signed_area_large_coordinates():
+    # a plain shoelace sum of these products cancels to exactly 0.0
+    off = 1e8
+    tri = [(off, off), (off + 1, off), (off, off + 1e-3)]
+    assert signed_area(tri) > 0
+    assert signed_area(tri[::-1]) < 0
+    # with the right orientation the concave vertex is found
+    concave = [(off + x, off + y) for x, y in [(0,0),(5,0),(5,5),(3,2),(0,5)]]
+    assert find_first_concavity(concave) == 3
+    # the vectorized half-plane test gets the same orientation
+    assert in_convex_polygon((off + 0.25, off + 1e-4), tri)
+    assert in_convex_polygon((off + 0.25, off + 1e-4), tri[::-1])
+
+
+def test_compiled_signed_area_matches():
+    np = pytest.importorskip("numpy")
+    pip_numba = pytest.importorskip("pip_numba")
+    off = 1e8
+    tri = [(off, off), (off + 1, off), (off, off + 1e-3)]
+    assert pip_numba.signed_area(np.asarray(tri, dtype=np.float64)) == signed_area(tri)
+
+
+def test_signed_area_of_array_matches_list():
+    np = pytest.importorskip("numpy")
+    off = 1e8
+    tri = [(off, off), (off + 1, off), (off, off + 1e-3)]
+    for poly in [tri, tri[::-1], [(0,0),(4,0),(4,3),(0,3)], [(0,0),(5,0),(5,5),(3,2),(0,5)]]:
+        assert signed_area(np.asarray(poly, dtype=np.float64)) == pytest.approx(signed_area(poly))
+        assert (signed_area(np.asarray(poly)) > 0) == (signed_area(poly) > 0)